@@ -0,0 +1,89 @@
+# Analytics rollup - daily post counts by source, keyword and status
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from models import ArchivedPost, BlogPost, DailyPostRollup, split_keywords
+
+SOURCE_TOTAL = ''  # keyword value of the per-source total rows
+
+
+def post_statuses(is_approved: bool, is_posted: bool) -> List[str]:
+    statuses = ['total']
+    if is_approved:
+        statuses.append('approved')
+    if is_posted:
+        statuses.append('posted')
+    return statuses
+
+
+def apply_rollup_delta(db: Session, created_at: datetime, source_blog: Optional[str],
+                       keywords_matched: Optional[str], statuses: List[str], delta: int):
+    """Add delta to every rollup row a post contributes to (caller commits)"""
+    day = (created_at or datetime.utcnow()).date()
+    source = source_blog or ''
+    for status in statuses:
+        for keyword in [SOURCE_TOTAL] + split_keywords(keywords_matched):
+            updated = db.query(DailyPostRollup).filter(
+                DailyPostRollup.day == day,
+                DailyPostRollup.source_blog == source,
+                DailyPostRollup.keyword == keyword,
+                DailyPostRollup.status == status
+            ).update({DailyPostRollup.post_count: DailyPostRollup.post_count + delta}, synchronize_session=False)
+            if not updated:
+                db.add(DailyPostRollup(day=day, source_blog=source, keyword=keyword,
+                                       status=status, post_count=delta))
+    db.flush()
+
+
+def rebuild_rollups(db: Session):
+    """Recompute the whole rollup table from blog_posts and its archive (backfill/repair)"""
+    counts: Dict[Tuple, int] = defaultdict(int)
+    for model in (BlogPost, ArchivedPost):
+        rows = db.query(
+            model.created_at, model.source_blog, model.keywords_matched,
+            model.is_approved, model.is_posted
+        ).yield_per(1000)
+        for created_at, source_blog, keywords_matched, is_approved, is_posted in rows:
+            day = (created_at or datetime.utcnow()).date()
+            for status in post_statuses(is_approved, is_posted):
+                for keyword in [SOURCE_TOTAL] + split_keywords(keywords_matched):
+                    counts[(day, source_blog or '', keyword, status)] += 1
+
+    db.query(DailyPostRollup).delete(synchronize_session=False)
+    db.bulk_insert_mappings(DailyPostRollup, [
+        {'day': day, 'source_blog': source, 'keyword': keyword, 'status': status, 'post_count': count}
+        for (day, source, keyword, status), count in counts.items()
+    ])
+    db.commit()
+
+
+def get_status_totals(db: Session) -> Dict[str, int]:
+    """Number of posts per status: {'total': .., 'approved': .., 'posted': ..}"""
+    totals = {'total': 0, 'approved': 0, 'posted': 0}
+    rows = db.query(DailyPostRollup.status, func.sum(DailyPostRollup.post_count)).filter(
+        DailyPostRollup.keyword == SOURCE_TOTAL
+    ).group_by(DailyPostRollup.status)
+    for status, count in rows:
+        totals[status] = int(count or 0)
+    return totals
+
+
+def get_source_counts(db: Session, status: str = 'approved') -> List[Tuple[str, int]]:
+    rows = db.query(DailyPostRollup.source_blog, func.sum(DailyPostRollup.post_count)).filter(
+        DailyPostRollup.status == status,
+        DailyPostRollup.keyword == SOURCE_TOTAL
+    ).group_by(DailyPostRollup.source_blog)
+    return [(source, int(count)) for source, count in rows if count]
+
+
+def get_keyword_counts(db: Session, status: str = 'approved', limit: int = 10) -> List[Tuple[str, int]]:
+    total = func.sum(DailyPostRollup.post_count)
+    rows = db.query(DailyPostRollup.keyword, total).filter(
+        DailyPostRollup.status == status,
+        DailyPostRollup.keyword != SOURCE_TOTAL
+    ).group_by(DailyPostRollup.keyword).having(total > 0).order_by(total.desc()).limit(limit)
+    return [(keyword, int(count)) for keyword, count in rows]
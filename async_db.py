@@ -0,0 +1,63 @@
+# Async database access - engine and session factory for async services (FastAPI, async ingest)
+#
+# Same database, pragmas and pool sizing as models.engine, but through an
+# async driver (aiosqlite / asyncpg) so awaiting a query never blocks the
+# event loop. Tables are still created by models.create_tables().
+from typing import AsyncIterator
+
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from models import (
+    DATABASE_URL, DB_MAX_OVERFLOW, DB_POOL_SIZE, SQLITE_BUSY_TIMEOUT_MS, _configure_sqlite_connection
+)
+
+ASYNC_DRIVERS = {"sqlite": "sqlite+aiosqlite", "postgresql": "postgresql+asyncpg"}
+
+
+def async_database_url(database_url: str) -> str:
+    """sqlite:///x.db -> sqlite+aiosqlite:///x.db (URLs that name a driver are kept)"""
+    url = make_url(database_url)
+    if url.drivername in ASYNC_DRIVERS:
+        url = url.set(drivername=ASYNC_DRIVERS[url.drivername])
+    return url.render_as_string(hide_password=False)
+
+
+def build_async_engine(database_url: str) -> AsyncEngine:
+    url = make_url(async_database_url(database_url))
+
+    if url.get_backend_name() != "sqlite":
+        return create_async_engine(
+            url,
+            pool_size=DB_POOL_SIZE,
+            max_overflow=DB_MAX_OVERFLOW,
+            pool_pre_ping=True,
+            pool_recycle=1800,
+        )
+
+    connect_args = {"timeout": SQLITE_BUSY_TIMEOUT_MS / 1000}
+    if url.database in (None, "", ":memory:"):
+        new_engine = create_async_engine(url, connect_args=connect_args, poolclass=StaticPool)
+    else:
+        new_engine = create_async_engine(
+            url,
+            connect_args=connect_args,
+            pool_size=DB_POOL_SIZE,
+            max_overflow=DB_MAX_OVERFLOW,
+        )
+    # Pragmas (WAL, busy_timeout, foreign keys) are set on the driver connection
+    event.listen(new_engine.sync_engine, "connect", _configure_sqlite_connection)
+    return new_engine
+
+
+async_engine = build_async_engine(DATABASE_URL)
+# expire_on_commit=False: rows stay readable after commit without an implicit (blocking) refresh
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+
+async def get_async_db() -> AsyncIterator[AsyncSession]:
+    """Async counterpart of models.get_db, usable as a FastAPI dependency"""
+    async with AsyncSessionLocal() as db:
+        yield db
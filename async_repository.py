@@ -0,0 +1,72 @@
+# Async repository - awaitable versions of the queries the app runs
+#
+# Each function hands the sync implementation (post_repository,
+# analytics_rollup, trending_keywords) to AsyncSession.run_sync. The SQL and
+# transaction handling live in one place, while the I/O goes through the
+# async driver, so callers on an event loop never block on the database.
+#
+# Returned rows are plain ORM objects. Relationships and the deferred
+# BlogPost.content can't be lazy-loaded from async code; use
+# get_post_content for the article text.
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+import analytics_rollup
+import post_repository
+import trending_keywords
+from models import BlogPost
+from post_repository import PageCursor
+
+
+async def count_approved(db: AsyncSession, keyword: Optional[str] = None) -> int:
+    return await db.run_sync(post_repository.count_approved, keyword)
+
+
+async def get_approved_page(db: AsyncSession, page_size: int, after: Optional[PageCursor] = None,
+                            keyword: Optional[str] = None) -> Tuple[List[BlogPost], Optional[PageCursor]]:
+    return await db.run_sync(post_repository.get_approved_page, page_size, after, keyword)
+
+
+async def search_approved_posts(db: AsyncSession, search: str, limit: int = 20) -> List[BlogPost]:
+    return await db.run_sync(post_repository.search_approved_posts, search, limit)
+
+
+async def get_keyword_names(db: AsyncSession) -> List[str]:
+    return await db.run_sync(post_repository.get_keyword_names)
+
+
+async def get_post_content(db: AsyncSession, post_id: int) -> Optional[str]:
+    return await db.run_sync(post_repository.get_post_content, post_id)
+
+
+async def add_approved_posts(db: AsyncSession, posts: List[dict]) -> List[BlogPost]:
+    return await db.run_sync(post_repository.add_approved_posts, posts)
+
+
+async def mark_posts_posted(db: AsyncSession, post_ids: List[int]) -> List[BlogPost]:
+    return await db.run_sync(post_repository.mark_posts_posted, post_ids)
+
+
+async def update_linkedin_post(db: AsyncSession, post_id: int, linkedin_post: str) -> Optional[BlogPost]:
+    return await db.run_sync(post_repository.update_linkedin_post, post_id, linkedin_post)
+
+
+async def remove_posts(db: AsyncSession, post_ids: List[int]) -> List[BlogPost]:
+    return await db.run_sync(post_repository.remove_posts, post_ids)
+
+
+async def get_status_totals(db: AsyncSession) -> Dict[str, int]:
+    return await db.run_sync(analytics_rollup.get_status_totals)
+
+
+async def get_source_counts(db: AsyncSession, status: str = 'approved') -> List[Tuple[str, int]]:
+    return await db.run_sync(analytics_rollup.get_source_counts, status)
+
+
+async def get_keyword_counts(db: AsyncSession, status: str = 'approved', limit: int = 10) -> List[Tuple[str, int]]:
+    return await db.run_sync(analytics_rollup.get_keyword_counts, status, limit)
+
+
+async def get_trending_keywords(db: AsyncSession, limit: int = 10) -> List[Tuple[str, float]]:
+    return await db.run_sync(trending_keywords.get_trending_keywords, limit)
@@ -0,0 +1,248 @@
+# Benchmarks for the content pipeline hot paths
+#
+# Usage:
+#   python benchmarks.py dedup --posts 10000
+#   python benchmarks.py queries --rows 100000
+#   python benchmarks.py search --rows 20000
+import argparse
+import hashlib
+import os
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List
+
+# Benchmarks always run against a throwaway database
+os.environ["DATABASE_URL"] = "sqlite:///" + os.path.join(tempfile.mkdtemp(), "bench.db")
+
+from sqlalchemy import func, text  # noqa: E402
+
+from models import Base, BlogPost, SessionLocal, create_blog_post_indexes, create_tables, engine  # noqa: E402
+from content_intelligence import ContentIntelligence  # noqa: E402
+
+VOCABULARY = [f"word{i}" for i in range(5000)]
+
+
+def make_posts(count: int, duplicate_ratio: float = 0.2, seed: int = 7) -> List[Dict]:
+    """Synthetic posts where roughly duplicate_ratio of them are near-copies"""
+    rng = random.Random(seed)
+    posts = []
+    for i in range(count):
+        if posts and rng.random() < duplicate_ratio:
+            original = rng.choice(posts)
+            words = original['summary'].split()
+            words[rng.randrange(len(words))] = rng.choice(VOCABULARY)
+            summary = ' '.join(words)
+            title = original['title'] + ' (update)'
+        else:
+            title = ' '.join(rng.choices(VOCABULARY, k=8))
+            summary = ' '.join(rng.choices(VOCABULARY, k=40))
+        posts.append({'title': title, 'url': f"https://example.com/{i}", 'summary': summary})
+    return posts
+
+
+def pairwise_detect_duplicates(intelligence: ContentIntelligence, posts: List[Dict],
+                               similarity_threshold: float = 0.7) -> List[Dict]:
+    """The original O(n^2) Jaccard dedup, kept here as the baseline"""
+    unique_posts = []
+    seen_hashes = set()
+    for post in posts:
+        content_hash = hashlib.md5(post['title'].encode()).hexdigest()
+        if content_hash in seen_hashes:
+            continue
+        is_duplicate = False
+        for existing_post in unique_posts:
+            similarity = intelligence.calculate_content_similarity(
+                post['title'] + ' ' + post.get('summary', ''),
+                existing_post['title'] + ' ' + existing_post.get('summary', '')
+            )
+            if similarity > similarity_threshold:
+                is_duplicate = True
+                break
+        if not is_duplicate:
+            unique_posts.append(post)
+            seen_hashes.add(content_hash)
+    return unique_posts
+
+
+def timed(label: str, func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    print(f"{label:<45} {time.perf_counter() - start:8.3f}s")
+    return result
+
+
+def bench_dedup(args):
+    create_tables()
+    intelligence = ContentIntelligence()
+    posts = make_posts(args.posts)
+    print(f"Deduplicating {len(posts)} synthetic posts")
+
+    unique = timed("MinHash-LSH detect_duplicates", intelligence.detect_duplicates, posts, check_history=False)
+    print(f"  kept {len(unique)} posts")
+
+    baseline_posts = posts[:args.baseline_posts]
+    baseline = timed(f"Pairwise Jaccard on first {len(baseline_posts)} posts",
+                     pairwise_detect_duplicates, intelligence, baseline_posts)
+    lsh_subset = intelligence.detect_duplicates(baseline_posts, check_history=False)
+    print(f"  kept {len(baseline)} posts (MinHash-LSH kept {len(lsh_subset)} of the same subset)")
+
+    # Check a fresh batch against the persisted history
+    db = SessionLocal()
+    db.bulk_save_objects([
+        BlogPost(title=post['title'], url=post['url'], summary=post['summary'],
+                 is_approved=True, status='approved')
+        for post in unique
+    ])
+    db.commit()
+    db.close()
+    timed(f"Backfill signatures for {len(unique)} stored posts", intelligence._get_history_index)
+    timed("Resync index with no new posts", intelligence._get_history_index)
+    fresh = make_posts(200, seed=11) + [dict(post, url=post['url'] + '?copy') for post in unique[:50]]
+    kept = timed(f"Dedup {len(fresh)} new posts against history", intelligence.detect_duplicates, fresh)
+    print(f"  kept {len(kept)} of {len(fresh)} (50 were copies of stored posts)")
+
+
+SOURCES = ['DeepMind Blog', 'Microsoft Research', 'Anthropic News', 'NVIDIA Developer Blog',
+           'VentureBeat AI', 'TechCrunch AI', 'Hugging Face Blog', 'Quick Generator']
+
+
+def seed_blog_posts(rows: int, seed: int = 3):
+    """Insert synthetic blog_posts rows (about 10% approved, a third of those posted)"""
+    rng = random.Random(seed)
+    start = datetime(2024, 1, 1)
+    batch = []
+    with engine.begin() as connection:
+        for i in range(rows):
+            is_approved = rng.random() < 0.1
+            batch.append({
+                'title': f"Post {i}",
+                'url': f"https://example.com/post/{i}",
+                'summary': 'summary ' * 20,
+                'linkedin_post': 'linkedin ' * 80,
+                'source_blog': rng.choice(SOURCES),
+                'keywords_matched': ', '.join(rng.sample(['ai', 'llm', 'ml', 'gpt', 'nlp', 'rag'], 2)),
+                'created_at': start + timedelta(minutes=rng.randrange(60 * 24 * 365)),
+                'is_approved': is_approved,
+                'is_posted': is_approved and rng.random() < 0.33,
+                'status': 'approved' if is_approved else 'candidate',
+            })
+            if len(batch) == 10000:
+                connection.execute(BlogPost.__table__.insert(), batch)
+                batch = []
+        if batch:
+            connection.execute(BlogPost.__table__.insert(), batch)
+        connection.execute(text("ANALYZE"))
+
+
+PAGE_QUERIES = {
+    "Approved page (newest 20)": lambda db: db.query(BlogPost).filter(
+        BlogPost.is_approved == True).order_by(BlogPost.created_at.desc()).limit(20).all(),
+    "Hero approved count": lambda db: db.query(BlogPost).filter(BlogPost.is_approved == True).count(),
+    "Hero posted count": lambda db: db.query(BlogPost).filter(BlogPost.is_posted == True).count(),
+    "Quick Generator count": lambda db: db.query(BlogPost).filter(
+        BlogPost.source_blog == 'Quick Generator').count(),
+    "Approved posts per source": lambda db: db.query(BlogPost.source_blog, func.count(BlogPost.id)).filter(
+        BlogPost.is_approved == True).group_by(BlogPost.source_blog).all(),
+}
+
+
+def time_page_queries(repeat: int) -> Dict[str, float]:
+    timings = {}
+    db = SessionLocal()
+    for label, query in PAGE_QUERIES.items():
+        runs = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            query(db)
+            runs.append(time.perf_counter() - start)
+        timings[label] = sorted(runs)[len(runs) // 2]
+    db.close()
+    return timings
+
+
+def bench_queries(args):
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as connection:
+        for index in BlogPost.__table__.indexes:
+            if index.name != "ix_blog_posts_id":
+                index.drop(bind=connection)
+
+    print(f"Seeding {args.rows} blog_posts rows")
+    seed_blog_posts(args.rows)
+    before = time_page_queries(args.repeat)
+
+    with engine.begin() as connection:
+        create_blog_post_indexes(connection)
+        connection.execute(text("ANALYZE"))
+    after = time_page_queries(args.repeat)
+
+    print(f"{'Query (median of ' + str(args.repeat) + ')':<32} {'no index':>10} {'indexed':>10}")
+    for label in PAGE_QUERIES:
+        print(f"{label:<32} {before[label] * 1000:>8.2f}ms {after[label] * 1000:>8.2f}ms")
+
+
+def bench_search(args):
+    create_tables()
+    rng = random.Random(5)
+    topics = ['transformer', 'diffusion', 'robotics', 'retrieval', 'agents', 'quantization', 'vision', 'speech']
+    print(f"Seeding {args.rows} approved posts")
+    with engine.begin() as connection:
+        connection.execute(BlogPost.__table__.insert(), [{
+            'title': f"{rng.choice(topics).title()} update {i}",
+            'url': f"https://example.com/search/{i}",
+            'summary': ' '.join(rng.choices(VOCABULARY, k=40) + rng.sample(topics, 2)),
+            'linkedin_post': ' '.join(rng.choices(VOCABULARY, k=150)),
+            'source_blog': rng.choice(SOURCES),
+            'created_at': datetime(2024, 1, 1) + timedelta(minutes=i),
+            'is_approved': True,
+            'is_posted': False,
+            'status': 'approved',
+        } for i in range(args.rows)])
+
+    from post_repository import search_approved_posts
+    db = SessionLocal()
+    for search in ['diffusion', 'robotics agents', 'quant', 'word123 word456']:
+        runs = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            results = search_approved_posts(db, search, limit=20)
+            runs.append(time.perf_counter() - start)
+        like = f"%{search}%"
+        start = time.perf_counter()
+        db.query(BlogPost).filter(BlogPost.is_approved == True, (
+            BlogPost.title.like(like) | BlogPost.summary.like(like) | BlogPost.linkedin_post.like(like)
+        )).limit(20).all()
+        like_time = time.perf_counter() - start
+        print(f"{search!r:<22} FTS5 {sorted(runs)[len(runs) // 2] * 1000:7.2f}ms "
+              f"({len(results)} results)   LIKE scan {like_time * 1000:7.2f}ms")
+    db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark pipeline hot paths")
+    subparsers = parser.add_subparsers(dest="benchmark", required=True)
+
+    dedup = subparsers.add_parser("dedup", help="near-duplicate detection")
+    dedup.add_argument("--posts", type=int, default=10000)
+    dedup.add_argument("--baseline-posts", type=int, default=1000,
+                       help="posts for the O(n^2) baseline (it is slow at 10k)")
+    dedup.set_defaults(func=bench_dedup)
+
+    queries = subparsers.add_parser("queries", help="blog_posts page queries with and without indexes")
+    queries.add_argument("--rows", type=int, default=100000)
+    queries.add_argument("--repeat", type=int, default=15)
+    queries.set_defaults(func=bench_queries)
+
+    search = subparsers.add_parser("search", help="full-text search over approved posts")
+    search.add_argument("--rows", type=int, default=20000)
+    search.add_argument("--repeat", type=int, default=15)
+    search.set_defaults(func=bench_search)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,9 +3,13 @@ import feedparser
 from bs4 import BeautifulSoup
 from datetime import datetime, timedelta
 import re
-from typing import List, Dict
+from typing import Callable, List, Dict, Optional, Tuple
+from collections import Counter
 from news_api_monitor import NewsAPIMonitor
-from config import NEWS_API_ENABLED
+from config import (
+    NEWS_API_ENABLED, PREFILTER_ACCEPT_MIN_KEYWORDS,
+    PREFILTER_REJECT_MIN_SUMMARY_CHARS, PREFILTER_SUMMARY_ONLY_MIN_CHARS
+)
 
 class BlogMonitor:
     def __init__(self):
@@ -41,12 +45,16 @@ class BlogMonitor:
                 continue
         return blog_url
     
-    def fetch_blog_posts(self, blog_urls: List[str]) -> List[Dict]:
-        """Fetch recent posts from blog URLs and NewsAPI"""
+    def fetch_blog_posts(self, blog_urls: List[str], progress: Optional[Callable[[int, int], None]] = None) -> List[Dict]:
+        """Fetch recent posts from blog URLs and NewsAPI
+        
+        progress(feeds_done, feeds_total) is called after each blog; it may
+        raise to abort the fetch (used for cancelling background scans).
+        """
         all_posts = []
         
         # Fetch from blog URLs
-        for blog_url in blog_urls:
+        for feeds_done, blog_url in enumerate(blog_urls, 1):
             try:
                 print(f"Fetching from: {blog_url}")
                 # Try RSS first
@@ -78,6 +86,9 @@ class BlogMonitor:
                     
             except Exception as e:
                 print(f"Error fetching from {blog_url}: {e}")
+            
+            if progress:
+                progress(feeds_done, len(blog_urls))
         
         # Add NewsAPI content if enabled
         if NEWS_API_ENABLED:
@@ -310,9 +321,10 @@ class BlogMonitor:
         print(f"Found {len(filtered_posts)} posts in date range")
         return filtered_posts
     
-    def fetch_posts_by_date(self, blog_urls: List[str], target_date: datetime, days_range: int = 1) -> List[Dict]:
+    def fetch_posts_by_date(self, blog_urls: List[str], target_date: datetime, days_range: int = 1,
+                            progress: Optional[Callable[[int, int], None]] = None) -> List[Dict]:
         """Fetch posts from specific date across all blogs"""
-        all_posts = self.fetch_blog_posts(blog_urls)
+        all_posts = self.fetch_blog_posts(blog_urls, progress)
         return self.filter_posts_by_date(all_posts, target_date, days_range)
     
     def is_ai_related(self, title: str, content: str) -> List[str]:
@@ -326,6 +338,44 @@ class BlogMonitor:
                 
         return matched_keywords
     
+    def prefilter_post(self, post_data: Dict) -> Tuple[str, List[str]]:
+        """Judge relevance from the feed title and summary alone
+        
+        Returns ('accept' | 'reject' | 'fetch', matched keywords). Only
+        'fetch' items are ambiguous enough to need the full article.
+        """
+        summary = re.sub(r'<[^>]+>', ' ', post_data.get('content') or '').strip()
+        keywords = self.is_ai_related(post_data.get('title', ''), summary)
+        
+        if len(keywords) >= PREFILTER_ACCEPT_MIN_KEYWORDS:
+            return 'accept', keywords
+        if not keywords and len(summary) >= PREFILTER_REJECT_MIN_SUMMARY_CHARS:
+            return 'reject', keywords
+        return 'fetch', keywords
+    
+    def resolve_content(self, post_data: Dict, stats: Counter) -> Tuple[str, List[str]]:
+        """Content and keywords for a feed item, downloading the page only when needed
+        
+        Returns ('', []) for items rejected by the pre-filter. stats counts
+        accepted/rejected/fetched items and fetches_saved for the scan report.
+        """
+        decision, keywords = self.prefilter_post(post_data)
+        stats[decision] += 1
+        
+        if decision == 'reject':
+            stats['fetches_saved'] += 1
+            return '', []
+        
+        summary = re.sub(r'<[^>]+>', ' ', post_data.get('content') or '').strip()
+        if decision == 'accept' and len(summary) >= PREFILTER_SUMMARY_ONLY_MIN_CHARS:
+            stats['fetches_saved'] += 1
+            return summary, keywords
+        
+        full_content = self.get_full_content(post_data['url'])
+        if decision == 'accept':
+            return full_content or summary, keywords
+        return full_content, self.is_ai_related(post_data['title'], full_content)
+    
     def get_full_content(self, url: str) -> str:
         """Extract full article content from URL"""
         try:
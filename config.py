@@ -49,3 +49,47 @@ DATE_BASED_SEARCH = True  # Enable date-based content search
 MAX_SEARCH_DAYS = 30  # Maximum days to search back from selected date
 DATE_RANGE_DAYS = 7  # Search within 7-day range from selected date
 DEFAULT_POSTS_LIMIT = 20  # Default limit when no date specified
+UI_CARD_BATCH_SIZE = 10  # Post cards rendered per "Show more" step on the Dashboard and Approved pages
+UI_READ_CACHE_TTL_SECONDS = 60  # Cached page queries; in-process writes invalidate at once, this bounds staleness from manage.py
+UI_READ_CACHE_MAX_ENTRIES = 200
+
+# Trending keyword settings
+TRENDING_WINDOW_HOURS = 72  # Only buckets from the last 3 days count towards trends
+TRENDING_HALF_LIFE_HOURS = 24  # A keyword mention loses half its weight per day
+TRENDING_RETENTION_DAYS = 30  # Older hourly buckets are pruned
+
+# Personalization settings - how much each user action moves a keyword/source preference
+PREFERENCE_EVENT_WEIGHTS = {
+    'approved': 1,
+    'posted': 1,  # Posting is a stronger signal on top of the approval
+    'removed': -1,
+}
+
+# Ranking settings
+ENGAGEMENT_LLM_TOP_K = 10  # Only the best K locally scored posts get an LLM engagement prediction
+REVIEW_SIMILAR_APPROVED_LOOKBACK = 200  # Latest approved posts candidates are compared against on the Dashboard
+
+# Story clustering - items whose title+summary SimHash differ in at most this many bits are one story
+STORY_SIMHASH_MAX_DISTANCE = 12
+
+# Pre-filter - decide relevance from the feed title/summary before downloading the article
+PREFILTER_ACCEPT_MIN_KEYWORDS = 2  # This many keyword hits in title+summary is a clear hit
+PREFILTER_REJECT_MIN_SUMMARY_CHARS = 150  # Zero hits only counts as a clear miss with a real summary
+PREFILTER_SUMMARY_ONLY_MIN_CHARS = 800  # Clear hits with a summary this long are generated without a fetch
+
+# Retention - blog_posts rows older than this move to blog_posts_archive (python manage.py retention)
+RETENTION_ARCHIVE_AFTER_DAYS = 180
+RETENTION_BATCH_SIZE = 500  # Rows moved per transaction, keeps write locks short
+
+# Scan pipeline (post_pipeline.py)
+PIPELINE_MAX_POSTS_PER_SOURCE = 2  # Source diversity: only the first N items per blog are processed
+PIPELINE_STAGE_WORKERS = {
+    'content': 8,  # Page fetches are network-bound
+    'summarize': 4,  # LLM calls - keep within the API rate limit
+    'generate': 4,
+}
+
+# Background scan jobs (scan_jobs.py)
+SCAN_JOB_WORKERS = 2  # Scans that can run at the same time, further submissions queue
+SCAN_JOB_HISTORY = 20  # Finished jobs kept for status lookups
+SCAN_JOB_CACHE_TTL_SECONDS = 900  # A finished date-range search is reused for identical searches this long
@@ -1,12 +1,21 @@
 # Advanced Content Intelligence - ML-powered filtering and predictions
 import re
 import hashlib
+import heapq
+import json
 from datetime import datetime, timedelta
-from typing import List, Dict, Tuple
+from typing import List, Dict, Tuple, Optional
 from collections import Counter, defaultdict
 import requests
 import os
 from dotenv import load_dotenv
+from models import SessionLocal, EngagementPrediction, split_keywords
+from config import ENGAGEMENT_LLM_TOP_K
+from engagement_model import LocalEngagementModel
+from near_duplicate_index import NearDuplicateIndex, minhash_signature
+from similarity_engine import TfidfEngine, post_text
+from preference_store import apply_preference_events, backfill_preferences
+from trending_keywords import bucket_start, record_keyword_counts, get_trending_keywords, prune_buckets
 
 load_dotenv()
 
@@ -14,8 +23,13 @@ class ContentIntelligence:
     def __init__(self):
         self.api_key = os.getenv("CEREBRAS_API_KEY")
         self.base_url = "https://api.cerebras.ai/v1/chat/completions"
-        self.user_preferences = defaultdict(int)  # Track user approval patterns
-        self.trending_keywords = Counter()  # Track trending topics
+        self.user_preferences = defaultdict(int)  # Snapshot of persisted approval patterns
+        self._preferences_loaded = False
+        self.trending_keywords = Counter()  # Snapshot of decayed trending scores
+        self._last_bucket_prune = datetime.min
+        self.engagement_cache = {}  # content hash -> scores, backed by engagement_predictions
+        self.engagement_model = LocalEngagementModel()  # First-stage ranking model
+        self.history_index = NearDuplicateIndex()  # MinHash-LSH index of stored posts
         
     def calculate_content_similarity(self, content1: str, content2: str) -> float:
         """Calculate similarity between two pieces of content (0-1 score)"""
@@ -31,8 +45,76 @@ class ContentIntelligence:
         
         return intersection / union if union > 0 else 0.0
     
-    def detect_duplicates(self, posts: List[Dict], similarity_threshold: float = 0.7) -> List[Dict]:
-        """Remove duplicate/similar content"""
+    def build_similarity_engine(self, posts: List[Dict]) -> TfidfEngine:
+        """Fit one TF-IDF matrix for a batch so similarity checks can share it"""
+        return TfidfEngine().fit([post_text(post) for post in posts])
+    
+    def find_similar_to_approved(self, posts: List[Dict], approved_posts: List[Dict],
+                                 similarity_threshold: float = 0.5,
+                                 engine: Optional[TfidfEngine] = None) -> List[Dict]:
+        """Copies of the posts that closely resemble an already approved post
+        
+        Each copy carries 'approved_similarity' and 'similar_approved_title';
+        the input dicts are left untouched. Pass the engine from
+        build_similarity_engine to reuse the batch vectors.
+        """
+        if not posts or not approved_posts:
+            return []
+        
+        engine = engine or self.build_similarity_engine(posts)
+        approved_vectors = engine.transform([post_text(post) for post in approved_posts])
+        similarities = engine.similarity_to(approved_vectors)
+        best_matches = similarities.argmax(axis=1)
+        
+        similar_posts = []
+        for i, post in enumerate(posts):
+            score = float(similarities[i, best_matches[i]])
+            if score > similarity_threshold:
+                similar_posts.append({
+                    **post,
+                    'approved_similarity': score,
+                    'similar_approved_title': approved_posts[best_matches[i]].get('title', ''),
+                })
+        
+        return similar_posts
+    
+    def group_by_topic(self, posts: List[Dict], similarity_threshold: float = 0.3,
+                       engine: Optional[TfidfEngine] = None) -> List[List[Dict]]:
+        """Group posts about the same topic, largest groups first"""
+        engine = engine or self.build_similarity_engine(posts)
+        labels = engine.group_labels(similarity_threshold)
+        
+        groups = defaultdict(list)
+        for post, label in zip(posts, labels):
+            groups[label].append(post)
+        
+        return sorted(groups.values(), key=len, reverse=True)
+    
+    def arrange_for_review(self, posts: List[Dict], approved_posts: List[Dict]) -> List[Dict]:
+        """Candidates in review order: same-topic posts next to each other,
+        flagged with 'similar_approved_title' when they repeat an approved post.
+        One TF-IDF fit serves both checks; the input dicts are not modified.
+        """
+        if not posts:
+            return []
+        engine = self.build_similarity_engine(posts)
+        similar = {
+            post['url']: post
+            for post in self.find_similar_to_approved(posts, approved_posts, engine=engine)
+        }
+        return [similar.get(post['url'], post) for group in self.group_by_topic(posts, engine=engine) for post in group]
+    
+    def detect_duplicates(self, posts: List[Dict], similarity_threshold: float = 0.7,
+                          check_history: bool = True) -> List[Dict]:
+        """Remove duplicate/similar content
+
+        Uses a MinHash-LSH index so each post is compared only with likely
+        matches instead of every unique post so far. With check_history,
+        posts that resemble anything already in the blog_posts table are
+        dropped as well.
+        """
+        history_index = self._get_history_index() if check_history else None
+        batch_index = NearDuplicateIndex()
         unique_posts = []
         seen_hashes = set()
         
@@ -43,22 +125,31 @@ class ContentIntelligence:
                 continue
                 
             # Check similarity with existing posts
-            is_duplicate = False
-            for existing_post in unique_posts:
-                similarity = self.calculate_content_similarity(
-                    post['title'] + ' ' + post.get('summary', ''),
-                    existing_post['title'] + ' ' + existing_post.get('summary', '')
-                )
-                if similarity > similarity_threshold:
-                    is_duplicate = True
-                    break
+            signature = minhash_signature(post_text(post))
+            if signature is not None:
+                if batch_index.query(signature, similarity_threshold):
+                    continue
+                if history_index is not None and history_index.query(signature, similarity_threshold):
+                    continue
+                batch_index.add(len(unique_posts), signature)
             
-            if not is_duplicate:
-                unique_posts.append(post)
-                seen_hashes.add(content_hash)
+            unique_posts.append(post)
+            seen_hashes.add(content_hash)
                 
         return unique_posts
     
+    def _get_history_index(self) -> Optional[NearDuplicateIndex]:
+        """Near-duplicate index of stored posts, synced with the database"""
+        db = SessionLocal()
+        try:
+            self.history_index.sync_with_database(db)
+            return self.history_index
+        except Exception as e:
+            print(f"Error loading duplicate history: {e}")
+            return None
+        finally:
+            db.close()
+    
     def calculate_relevance_score(self, post: Dict) -> float:
         """Calculate relevance score based on keywords and trends (0-1 score)"""
         title = post.get('title', '').lower()
@@ -82,8 +173,21 @@ class ContentIntelligence:
         
         return min(1.0, (trending_score * 0.4 + recency_score * 0.3 + keyword_score * 0.3))
     
+    def engagement_cache_key(self, title: str, linkedin_post: str) -> str:
+        """Hash identifying one version of a post's text"""
+        return hashlib.sha256(f"{title or ''}\x00{linkedin_post or ''}".encode('utf-8')).hexdigest()
+    
     def predict_engagement(self, post: Dict) -> Dict:
-        """Predict engagement potential using AI"""
+        """Predict engagement potential using AI
+        
+        Scores are cached by a hash of title + linkedin_post, so re-ranking
+        an unchanged post never calls the LLM again.
+        """
+        cache_key = self.engagement_cache_key(post.get('title', ''), post.get('linkedin_post', ''))
+        cached = self._get_cached_engagement(cache_key)
+        if cached is not None:
+            return cached
+        
         try:
             prompt = f"""
             Analyze this LinkedIn post for engagement potential:
@@ -117,6 +221,7 @@ class ContentIntelligence:
             if response.status_code == 200:
                 result = response.json()["choices"][0]["message"]["content"].strip()
                 scores = self._parse_engagement_scores(result)
+                self._store_cached_engagement(cache_key, scores)
                 return scores
             else:
                 return {"engagement": 5, "shareability": 5, "relevance": 5, "trending": 5, "overall": 5}
@@ -125,6 +230,50 @@ class ContentIntelligence:
             print(f"Error predicting engagement: {e}")
             return {"engagement": 5, "shareability": 5, "relevance": 5, "trending": 5, "overall": 5}
     
+    def invalidate_engagement(self, title: str, linkedin_post: str):
+        """Drop the cached prediction for a post version (call when it is edited)"""
+        cache_key = self.engagement_cache_key(title, linkedin_post)
+        self.engagement_cache.pop(cache_key, None)
+        db = SessionLocal()
+        try:
+            db.query(EngagementPrediction).filter(EngagementPrediction.content_hash == cache_key).delete()
+            db.commit()
+        except Exception as e:
+            print(f"Error invalidating engagement cache: {e}")
+        finally:
+            db.close()
+    
+    def _get_cached_engagement(self, cache_key: str) -> Optional[Dict]:
+        if cache_key in self.engagement_cache:
+            return dict(self.engagement_cache[cache_key])
+        
+        db = SessionLocal()
+        try:
+            row = db.query(EngagementPrediction.scores).filter(
+                EngagementPrediction.content_hash == cache_key
+            ).first()
+        except Exception as e:
+            print(f"Error reading engagement cache: {e}")
+            return None
+        finally:
+            db.close()
+        
+        if row is None:
+            return None
+        self.engagement_cache[cache_key] = json.loads(row.scores)
+        return dict(self.engagement_cache[cache_key])
+    
+    def _store_cached_engagement(self, cache_key: str, scores: Dict):
+        self.engagement_cache[cache_key] = dict(scores)
+        db = SessionLocal()
+        try:
+            db.merge(EngagementPrediction(content_hash=cache_key, scores=json.dumps(scores)))
+            db.commit()
+        except Exception as e:
+            print(f"Error writing engagement cache: {e}")
+        finally:
+            db.close()
+    
     def _parse_engagement_scores(self, ai_response: str) -> Dict:
         """Parse AI response into engagement scores"""
         scores = {"engagement": 5, "shareability": 5, "relevance": 5, "trending": 5, "overall": 5}
@@ -144,26 +293,47 @@ class ContentIntelligence:
     def learn_user_preferences(self, approved_posts: List[Dict]):
         """Learn from user's approval patterns"""
         for post in approved_posts:
-            # Track preferred keywords
-            keywords = post.get('keywords_matched', '').split(',')
-            for keyword in keywords:
-                keyword = keyword.strip().lower()
-                if keyword:
-                    self.user_preferences[keyword] += 1
-            
-            # Track preferred sources
-            source = post.get('source_blog', '')
-            if source:
-                self.user_preferences[f"source:{source}"] += 1
+            self.record_preference_event(post, 'approved')
+    
+    def record_preference_event(self, post: Dict, event: str):
+        """Apply one user action ('approved', 'posted', 'removed') to the preference model
+        
+        Touches only the post's own keyword/source rows and the in-memory
+        snapshot, so the cost does not depend on the size of the history.
+        """
+        self.record_preference_events([post], event)
+    
+    def record_preference_events(self, posts: List[Dict], event: str):
+        """Apply the same user action to a batch of posts in one commit
+        
+        Callers record actions after committing them, so when this call
+        triggers the backfill the action is already part of the history.
+        """
+        if self._ensure_preferences_loaded():
+            return
+        feature_lists = [features for features in map(self._preference_features, posts) if features]
+        if not feature_lists:
+            return
+        
+        db = SessionLocal()
+        try:
+            deltas = apply_preference_events(db, feature_lists, event)
+        except Exception as e:
+            print(f"Error saving user preferences: {e}")
+            return
+        finally:
+            db.close()
+        
+        for feature, delta in deltas.items():
+            self.user_preferences[feature] += delta
     
     def get_personalized_score(self, post: Dict) -> float:
         """Calculate personalized score based on learned preferences"""
+        self._ensure_preferences_loaded()
         score = 0.0
         
         # Check keyword preferences
-        keywords = post.get('keywords_matched', '').split(',')
-        for keyword in keywords:
-            keyword = keyword.strip().lower()
+        for keyword in self._post_keywords(post):
             if keyword in self.user_preferences:
                 score += self.user_preferences[keyword] / 10
         
@@ -173,53 +343,149 @@ class ContentIntelligence:
         if source_key in self.user_preferences:
             score += self.user_preferences[source_key] / 5
         
-        return min(1.0, score)
+        return max(0.0, min(1.0, score))
     
-    def identify_trending_topics(self, posts: List[Dict]) -> List[Tuple[str, int]]:
-        """Identify trending topics from recent posts"""
-        recent_keywords = Counter()
-        
-        # Count keywords from recent posts (last 3 days)
-        cutoff_date = datetime.utcnow() - timedelta(days=3)
+    def _preference_features(self, post: Dict) -> List[str]:
+        """Keyword and source features a post contributes to the preference model"""
+        features = self._post_keywords(post)
+        source = post.get('source_blog', '')
+        if source:
+            features.append(f"source:{source}")
+        return features
+    
+    def _ensure_preferences_loaded(self) -> bool:
+        """Load the persisted preference snapshot once per process, True if it was just backfilled"""
+        if self._preferences_loaded:
+            return False
         
+        db = SessionLocal()
+        try:
+            weights, backfilled = backfill_preferences(db)
+            self.user_preferences = defaultdict(int, weights)
+            self._preferences_loaded = True
+            return backfilled
+        except Exception as e:
+            print(f"Error loading user preferences: {e}")
+            return False
+        finally:
+            db.close()
+    
+    def record_post_keywords(self, post: Dict):
+        """Count an ingested post's keywords towards the trending buckets"""
+        self.record_posts_keywords([post])
+    
+    def record_posts_keywords(self, posts: List[Dict]):
+        """Count a batch of ingested posts towards the trending buckets, one commit per hour bucket"""
+        counts_by_bucket = defaultdict(Counter)
         for post in posts:
-            post_date = post.get('created_at', datetime.utcnow())
-            if isinstance(post_date, str):
-                continue
-                
-            if post_date > cutoff_date:
-                keywords = post.get('keywords_matched', '').split(',')
-                for keyword in keywords:
-                    keyword = keyword.strip().lower()
-                    if keyword:
-                        recent_keywords[keyword] += 1
+            timestamp = bucket_start(post.get('created_at') or datetime.utcnow())
+            counts_by_bucket[timestamp].update(set(self._post_keywords(post)))
+        if not any(counts_by_bucket.values()):
+            return
         
-        # Update global trending keywords
-        self.trending_keywords.update(recent_keywords)
+        db = SessionLocal()
+        try:
+            for timestamp, counts in counts_by_bucket.items():
+                record_keyword_counts(db, counts, timestamp)
+            # Pruning is cheap but only needs to happen once in a while
+            if datetime.utcnow() - self._last_bucket_prune > timedelta(hours=1):
+                prune_buckets(db)
+                self._last_bucket_prune = datetime.utcnow()
+        except Exception as e:
+            print(f"Error recording trending keywords: {e}")
+        finally:
+            db.close()
+    
+    def identify_trending_topics(self, limit: int = 10) -> List[Tuple[str, float]]:
+        """Identify trending topics from the decayed keyword buckets
         
-        return recent_keywords.most_common(10)
+        Also refreshes the trending_keywords snapshot used by
+        calculate_relevance_score.
+        """
+        db = SessionLocal()
+        try:
+            trending = get_trending_keywords(db, limit=limit)
+        except Exception as e:
+            print(f"Error loading trending keywords: {e}")
+            return self.trending_keywords.most_common(limit)
+        finally:
+            db.close()
+        
+        self.trending_keywords = Counter(dict(trending))
+        return trending
+    
+    def _post_keywords(self, post: Dict) -> List[str]:
+        """Normalized keywords of a stored post or freshly processed post dict"""
+        raw_keywords = post.get('keywords_matched') or post.get('keywords') or ''
+        if not isinstance(raw_keywords, str):
+            raw_keywords = ','.join(raw_keywords)
+        return split_keywords(raw_keywords)
+    
+    def predict_local_engagement(self, post: Dict) -> float:
+        """Cheap engagement estimate (0-1) from the model trained on posting history"""
+        return self.engagement_model.predict(
+            self._post_keywords(post),
+            post.get('source_blog', ''),
+            len(post.get('linkedin_post') or '')
+        )
     
-    def rank_posts_by_intelligence(self, posts: List[Dict]) -> List[Dict]:
-        """Rank posts using all intelligence features"""
+    def _refresh_engagement_model(self):
+        """Retrain the local engagement model if approvals/postings changed"""
+        db = SessionLocal()
+        try:
+            if self.engagement_model.is_stale(db):
+                self.engagement_model.fit(db)
+        except Exception as e:
+            print(f"Error training local engagement model: {e}")
+        finally:
+            db.close()
+    
+    def rank_posts_by_intelligence(self, posts: List[Dict], top_k: int = ENGAGEMENT_LLM_TOP_K) -> List[Dict]:
+        """Rank posts using all intelligence features
+        
+        Two stages: every post gets a cheap local score (relevance,
+        personalization and the local engagement model), then only the
+        top_k of those get the LLM engagement prediction. The LLM-scored
+        posts come first, followed by the rest in local-score order.
+        """
+        self.identify_trending_topics()
+        self._refresh_engagement_model()
+        
         # Remove duplicates
         unique_posts = self.detect_duplicates(posts)
         
-        # Calculate scores for each post
+        # Stage one: local scores for every post
         for post in unique_posts:
             relevance = self.calculate_relevance_score(post)
             personalization = self.get_personalized_score(post)
-            engagement_pred = self.predict_engagement(post)
+            local_engagement = self.predict_local_engagement(post)
             
-            # Combined intelligence score
+            post['relevance_score'] = relevance
+            post['personalization_score'] = personalization
+            post['local_engagement_score'] = local_engagement
+            post['engagement_prediction'] = None
             post['intelligence_score'] = (
                 relevance * 0.3 +
                 personalization * 0.3 +
-                (engagement_pred['overall'] / 10) * 0.4
+                local_engagement * 0.4
             )
+        
+        # Stage two: LLM engagement prediction for the top candidates only
+        candidates = heapq.nlargest(top_k, unique_posts, key=lambda x: x['intelligence_score'])
+        candidate_ids = {id(post) for post in candidates}
+        for post in candidates:
+            engagement_pred = self.predict_engagement(post)
             
-            post['relevance_score'] = relevance
-            post['personalization_score'] = personalization
+            # Combined intelligence score
+            post['intelligence_score'] = (
+                post['relevance_score'] * 0.3 +
+                post['personalization_score'] * 0.3 +
+                (engagement_pred['overall'] / 10) * 0.4
+            )
             post['engagement_prediction'] = engagement_pred
         
-        # Sort by intelligence score
-        return sorted(unique_posts, key=lambda x: x.get('intelligence_score', 0), reverse=True)
\ No newline at end of file
+        remaining = [post for post in unique_posts if id(post) not in candidate_ids]
+        return (
+            sorted(candidates, key=lambda x: x['intelligence_score'], reverse=True) +
+            sorted(remaining, key=lambda x: x['intelligence_score'], reverse=True)
+        )
@@ -0,0 +1,119 @@
+# Maintenance commands for the posts database
+#
+# Usage:
+#   python manage.py retention --days 180 [--drop-text] [--no-vacuum]
+#   python manage.py vacuum
+#   python manage.py export posts.jsonl        (or posts.parquet)
+#   python manage.py import posts.jsonl
+#   python manage.py scan [--date 2025-01-31 --days 7]
+#
+# Schedule retention from cron (or Task Scheduler) to run it periodically, e.g.
+#   0 3 * * 0  cd /path/to/app && python manage.py retention
+import argparse
+from datetime import datetime
+
+from models import SessionLocal, create_tables, engine
+from config import BLOG_URLS, RETENTION_ARCHIVE_AFTER_DAYS
+from retention import archive_old_posts, compact_database
+from post_transfer import DEFAULT_CHUNK_SIZE, export_posts, import_posts
+
+
+def _print_sizes(sizes):
+    if sizes['before'] is not None:
+        print(f"Database size: {sizes['before'] / 1e6:.1f} MB -> {sizes['after'] / 1e6:.1f} MB")
+
+
+def run_retention(args):
+    create_tables()
+    db = SessionLocal()
+    try:
+        archived = archive_old_posts(db, older_than_days=args.days, drop_text=args.drop_text)
+    finally:
+        db.close()
+    print(f"Archived {archived} posts older than {args.days} days"
+          + (" (text columns dropped)" if args.drop_text else ""))
+
+    if archived and not args.no_vacuum:
+        _print_sizes(compact_database(engine))
+
+
+def run_vacuum(args):
+    _print_sizes(compact_database(engine))
+
+
+def run_export(args):
+    create_tables()
+    db = SessionLocal()
+    try:
+        written = export_posts(db, args.path, chunk_size=args.chunk_size)
+    finally:
+        db.close()
+    print(f"Exported {written} posts to {args.path}")
+
+
+def run_import(args):
+    create_tables()
+    db = SessionLocal()
+    try:
+        imported = import_posts(db, args.path, chunk_size=args.chunk_size)
+    finally:
+        db.close()
+    print(f"Imported {imported} posts from {args.path}")
+
+
+def run_scan(args):
+    from ai_summarizer import AISummarizer
+    from blog_monitor import BlogMonitor
+    from content_intelligence import ContentIntelligence
+    from post_pipeline import PostPipeline
+    from scan_jobs import store_candidate, stored_urls
+
+    create_tables()
+    content_intelligence = ContentIntelligence()
+    pipeline = PostPipeline(BlogMonitor(), AISummarizer(), known_urls=stored_urls,
+                            on_result=lambda post: store_candidate(post, content_intelligence))
+    if args.date:
+        posts = pipeline.scan_by_date(BLOG_URLS, datetime.strptime(args.date, "%Y-%m-%d"), args.days)
+    else:
+        posts = pipeline.scan_recent(BLOG_URLS)
+
+    for post in posts:
+        print(f"- [{post['source_blog']}] {post['title']} ({post['keywords']})")
+    print(f"{len(posts)} new candidates for review | {pipeline.report()}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Database maintenance")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    retention = subparsers.add_parser("retention", help="move old posts to blog_posts_archive")
+    retention.add_argument("--days", type=int, default=RETENTION_ARCHIVE_AFTER_DAYS)
+    retention.add_argument("--drop-text", action="store_true",
+                           help="don't keep content/summary/linkedin_post for archived posts")
+    retention.add_argument("--no-vacuum", action="store_true", help="skip VACUUM/ANALYZE afterwards")
+    retention.set_defaults(func=run_retention)
+
+    vacuum = subparsers.add_parser("vacuum", help="VACUUM and ANALYZE the database")
+    vacuum.set_defaults(func=run_vacuum)
+
+    export = subparsers.add_parser("export", help="stream all posts to a .jsonl or .parquet file")
+    export.add_argument("path")
+    export.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    export.set_defaults(func=run_export)
+
+    import_ = subparsers.add_parser("import", help="upsert posts from a .jsonl or .parquet export by URL")
+    import_.add_argument("path")
+    import_.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    import_.set_defaults(func=run_import)
+
+    scan = subparsers.add_parser("scan", help="scan the blogs, store new candidates for review, print stage timings")
+    scan.add_argument("--date", help="end date (YYYY-MM-DD) to search back from; default: latest posts")
+    scan.add_argument("--days", type=int, default=7)
+    scan.set_defaults(func=run_scan)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,196 @@
+# Lightweight schema migrations for existing blog_posts.db files
+#
+# create_all() only creates missing tables. Anything added to an existing
+# table (indexes, columns) is applied here, once per database, in order.
+#
+# Migration bodies are frozen: each must keep doing exactly what it did when
+# it shipped. Never derive one from the live models - a column or index added
+# to a model later would then run before the migration that adds its column.
+from collections import defaultdict
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import (
+    Boolean, Column, Date, DateTime, Integer, MetaData, String, Table, column, inspect, select, table, text
+)
+from sqlalchemy.engine import Connection, Engine
+
+_metadata = MetaData()
+schema_migrations = Table(
+    "schema_migrations", _metadata,
+    Column("version", Integer, primary_key=True),
+    Column("description", String, nullable=False),
+    Column("applied_at", DateTime, nullable=False),
+)
+
+
+def _create_index(connection: Connection, name: str, table: str, columns: Tuple[str, ...]):
+    connection.execute(text(f"CREATE INDEX IF NOT EXISTS {name} ON {table} ({', '.join(columns)})"))
+
+
+def _create_access_pattern_indexes(connection: Connection):
+    for name, columns in [
+        ("ix_blog_posts_approved_created", ("is_approved", "created_at")),
+        ("ix_blog_posts_posted_created", ("is_posted", "created_at")),
+        ("ix_blog_posts_source_created", ("source_blog", "created_at")),
+        ("ix_blog_posts_approved_source", ("is_approved", "source_blog")),
+    ]:
+        _create_index(connection, name, "blog_posts", columns)
+
+
+# Table shapes as the migrations below first saw them
+_blog_posts = table(
+    "blog_posts",
+    column("id", Integer), column("created_at", DateTime), column("source_blog", String),
+    column("keywords_matched", String), column("is_approved", Boolean), column("is_posted", Boolean),
+)
+_daily_post_rollups = table(
+    "daily_post_rollups",
+    column("day", Date), column("source_blog", String), column("keyword", String),
+    column("status", String), column("post_count", Integer),
+)
+_keywords = table("keywords", column("id", Integer), column("name", String))
+_post_keywords = table("post_keywords", column("post_id", Integer), column("keyword_id", Integer))
+
+
+def _split_keywords(keywords_matched: Optional[str]) -> List[str]:
+    keywords = []
+    for keyword in (keywords_matched or '').split(','):
+        keyword = keyword.strip().lower()
+        if keyword and keyword not in keywords:
+            keywords.append(keyword)
+    return keywords
+
+
+def _backfill_daily_rollups(connection: Connection):
+    counts: Dict[Tuple, int] = defaultdict(int)
+    rows = connection.execute(select(
+        _blog_posts.c.created_at, _blog_posts.c.source_blog, _blog_posts.c.keywords_matched,
+        _blog_posts.c.is_approved, _blog_posts.c.is_posted
+    ))
+    for created_at, source_blog, keywords_matched, is_approved, is_posted in rows:
+        day = (created_at or datetime.utcnow()).date()
+        statuses = ['total'] + (['approved'] if is_approved else []) + (['posted'] if is_posted else [])
+        for status in statuses:
+            for keyword in [''] + _split_keywords(keywords_matched):
+                counts[(day, source_blog or '', keyword, status)] += 1
+
+    connection.execute(_daily_post_rollups.delete())
+    if counts:
+        connection.execute(_daily_post_rollups.insert(), [
+            {'day': day, 'source_blog': source, 'keyword': keyword, 'status': status, 'post_count': count}
+            for (day, source, keyword, status), count in counts.items()
+        ])
+
+
+def _backfill_post_keywords(connection: Connection):
+    posts = connection.execute(select(_blog_posts.c.id, _blog_posts.c.keywords_matched)).all()
+    names_by_post = {post_id: _split_keywords(keywords_matched) for post_id, keywords_matched in posts}
+
+    known = set(connection.execute(select(_keywords.c.name)).scalars())
+    missing = sorted({name for names in names_by_post.values() for name in names} - known)
+    if missing:
+        connection.execute(_keywords.insert(), [{'name': name} for name in missing])
+    keyword_ids = {name: keyword_id for keyword_id, name in connection.execute(select(_keywords.c.id, _keywords.c.name))}
+
+    connection.execute(_post_keywords.delete())
+    associations = [
+        {'post_id': post_id, 'keyword_id': keyword_ids[name]}
+        for post_id, names in names_by_post.items() for name in names
+    ]
+    if associations:
+        connection.execute(_post_keywords.insert(), associations)
+
+
+def _create_full_text_index(connection: Connection):
+    """FTS5 index over title/summary/linkedin_post, kept in sync by triggers"""
+    if connection.dialect.name != "sqlite":
+        return  # search_approved_posts falls back to LIKE elsewhere
+
+    connection.execute(text("""
+        CREATE VIRTUAL TABLE IF NOT EXISTS blog_posts_fts USING fts5(
+            title, summary, linkedin_post,
+            content='blog_posts', content_rowid='id', tokenize='porter unicode61'
+        )
+    """))
+    connection.execute(text("""
+        CREATE TRIGGER IF NOT EXISTS blog_posts_fts_insert AFTER INSERT ON blog_posts BEGIN
+            INSERT INTO blog_posts_fts(rowid, title, summary, linkedin_post)
+            VALUES (new.id, new.title, new.summary, new.linkedin_post);
+        END
+    """))
+    connection.execute(text("""
+        CREATE TRIGGER IF NOT EXISTS blog_posts_fts_delete AFTER DELETE ON blog_posts BEGIN
+            INSERT INTO blog_posts_fts(blog_posts_fts, rowid, title, summary, linkedin_post)
+            VALUES ('delete', old.id, old.title, old.summary, old.linkedin_post);
+        END
+    """))
+    connection.execute(text("""
+        CREATE TRIGGER IF NOT EXISTS blog_posts_fts_update
+        AFTER UPDATE OF title, summary, linkedin_post ON blog_posts BEGIN
+            INSERT INTO blog_posts_fts(blog_posts_fts, rowid, title, summary, linkedin_post)
+            VALUES ('delete', old.id, old.title, old.summary, old.linkedin_post);
+            INSERT INTO blog_posts_fts(rowid, title, summary, linkedin_post)
+            VALUES (new.id, new.title, new.summary, new.linkedin_post);
+        END
+    """))
+    connection.execute(text("INSERT INTO blog_posts_fts(blog_posts_fts) VALUES ('rebuild')"))
+
+
+def _compress_post_content(connection: Connection):
+    """blog_posts.content becomes a zlib-compressed BLOB (models.CompressedText)
+
+    SQLite stores BLOBs in the existing TEXT column as they are. On
+    PostgreSQL the column type changes; content was never written before,
+    so nothing is carried over.
+    """
+    if connection.dialect.name != "postgresql":
+        return
+    connection.execute(text("ALTER TABLE blog_posts ALTER COLUMN content TYPE BYTEA USING NULL"))
+
+
+def _add_candidate_columns(connection: Connection):
+    """blog_posts.status/story_sources for the shared candidate store"""
+    columns = {column['name'] for column in inspect(connection).get_columns('blog_posts')}
+    if 'status' not in columns:
+        connection.execute(text("ALTER TABLE blog_posts ADD COLUMN status VARCHAR NOT NULL DEFAULT 'approved'"))
+        # Nothing unapproved was ever stored before, keep any such rows out of the candidate list
+        connection.execute(text("UPDATE blog_posts SET status = 'dismissed' WHERE NOT is_approved"))
+    if 'story_sources' not in columns:
+        connection.execute(text("ALTER TABLE blog_posts ADD COLUMN story_sources TEXT"))
+    _create_index(connection, "ix_blog_posts_status_created", "blog_posts", ("status", "created_at"))
+
+
+MIGRATIONS: List[Tuple[int, str, Callable[[Connection], None]]] = [
+    (1, "blog_posts access-pattern indexes", _create_access_pattern_indexes),
+    (2, "backfill daily_post_rollups", _backfill_daily_rollups),
+    (3, "backfill keywords/post_keywords from keywords_matched", _backfill_post_keywords),
+    (4, "blog_posts_fts full-text index", _create_full_text_index),
+    (5, "compressed blog_posts.content", _compress_post_content),
+    (6, "blog_posts.status and story_sources for scan candidates", _add_candidate_columns),
+]
+
+
+def run_migrations(engine: Engine) -> List[int]:
+    """Apply pending migrations, returns the versions that were applied"""
+    _metadata.create_all(bind=engine)
+    applied = []
+
+    with engine.begin() as connection:
+        done = set(connection.execute(select(schema_migrations.c.version)).scalars())
+        for version, description, migrate in MIGRATIONS:
+            if version in done:
+                continue
+            print(f"Applying migration {version}: {description}")
+            migrate(connection)
+            connection.execute(schema_migrations.insert().values(
+                version=version, description=description, applied_at=datetime.utcnow()
+            ))
+            applied.append(version)
+
+        # Refresh planner statistics so new indexes are actually used
+        if applied and connection.dialect.name == "sqlite":
+            connection.execute(text("ANALYZE"))
+
+    return applied
+
@@ -1,21 +1,65 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, create_engine
+from sqlalchemy import Column, Integer, String, Text, Date, DateTime, Boolean, LargeBinary, ForeignKey, Index, Table, create_engine, event
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, deferred, relationship, sessionmaker
+from sqlalchemy.types import TypeDecorator
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import QueuePool, StaticPool
 from datetime import datetime
+from typing import List, Optional
 import os
+import threading
+import zlib
 from dotenv import load_dotenv
 
 load_dotenv()
 
 Base = declarative_base()
 
+def split_keywords(keywords_matched: Optional[str]) -> List[str]:
+    """Normalized keyword names from a comma-separated keywords string"""
+    keywords = []
+    for keyword in (keywords_matched or '').split(','):
+        keyword = keyword.strip().lower()
+        if keyword and keyword not in keywords:
+            keywords.append(keyword)
+    return keywords
+
+post_keywords = Table(
+    "post_keywords", Base.metadata,
+    Column("post_id", Integer, ForeignKey("blog_posts.id", ondelete="CASCADE"), primary_key=True),
+    Column("keyword_id", Integer, ForeignKey("keywords.id", ondelete="CASCADE"), primary_key=True),
+    # Keyword -> posts lookups (filters, counts) without touching blog_posts rows
+    Index("ix_post_keywords_keyword_post", "keyword_id", "post_id"),
+)
+
+class CompressedText(TypeDecorator):
+    """Text stored zlib-compressed as a BLOB, decompressed on load
+
+    Plain strings already in the column (written before compression) are
+    returned as they are.
+    """
+    impl = LargeBinary
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        return zlib.compress(value.encode("utf-8"), 6)
+
+    def process_result_value(self, value, dialect):
+        if value is None or isinstance(value, str):
+            return value
+        return zlib.decompress(value).decode("utf-8")
+
 class BlogPost(Base):
     __tablename__ = "blog_posts"
     
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, nullable=False)
     url = Column(String, unique=True, nullable=False)
-    content = Column(Text)
+    # Extracted article text, compressed and only loaded when asked for
+    # (list and search queries never read it)
+    content = deferred(Column(CompressedText))
     summary = Column(Text)
     linkedin_post = Column(Text)
     source_blog = Column(String)
@@ -25,12 +69,193 @@ class BlogPost(Base):
     is_posted = Column(Boolean, default=False)
     is_approved = Column(Boolean, default=False)
 
+    # 'candidate' (generated by a scan, awaiting review), 'approved' or 'dismissed'.
+    # is_approved mirrors status == 'approved' for the existing queries.
+    status = Column(String, default="candidate", nullable=False)
+    story_sources = Column(Text)  # JSON list of the blogs that covered the same story
+
+    # Normalized copy of keywords_matched; the string is kept for display
+    keywords = relationship("Keyword", secondary=post_keywords, passive_deletes=True)
+
+    # Composite indexes for the filters/sorts the pages run: approved list
+    # by date, posted counts, per-source counts, analytics and candidates
+    __table_args__ = (
+        Index("ix_blog_posts_approved_created", "is_approved", "created_at"),
+        Index("ix_blog_posts_posted_created", "is_posted", "created_at"),
+        Index("ix_blog_posts_source_created", "source_blog", "created_at"),
+        Index("ix_blog_posts_approved_source", "is_approved", "source_blog"),
+        Index("ix_blog_posts_status_created", "status", "created_at"),
+    )
+
+class ArchivedPost(Base):
+    """A blog_posts row moved out of the hot table by the retention job (retention.py)
+
+    Text columns are NULL when the post was archived with drop_text.
+    """
+    __tablename__ = "blog_posts_archive"
+
+    id = Column(Integer, primary_key=True)
+    post_id = Column(Integer, nullable=False, index=True)  # id the row had in blog_posts
+    title = Column(String, nullable=False)
+    url = Column(String, nullable=False, index=True)
+    content = deferred(Column(CompressedText))
+    summary = Column(Text)
+    linkedin_post = Column(Text)
+    source_blog = Column(String)
+    keywords_matched = Column(String)
+    created_at = Column(DateTime, nullable=False, index=True)
+    is_posted = Column(Boolean, default=False)
+    is_approved = Column(Boolean, default=False)
+    archived_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+class Keyword(Base):
+    __tablename__ = "keywords"
+
+    id = Column(Integer, primary_key=True)
+    name = Column(String, unique=True, nullable=False)
+
+class PostSignature(Base):
+    """MinHash signature of a post's title + summary, used for near-duplicate lookups"""
+    __tablename__ = "post_signatures"
+
+    post_id = Column(Integer, ForeignKey("blog_posts.id", ondelete="CASCADE"), primary_key=True)
+    signature = Column(LargeBinary, nullable=False)
+
+class KeywordBucket(Base):
+    """Number of ingested posts mentioning a keyword within one hour"""
+    __tablename__ = "keyword_buckets"
+
+    bucket_start = Column(DateTime, primary_key=True)
+    keyword = Column(String, primary_key=True)
+    count = Column(Integer, default=0, nullable=False)
+
+class UserPreference(Base):
+    """Learned weight of a keyword or "source:<name>" feature"""
+    __tablename__ = "user_preferences"
+
+    feature = Column(String, primary_key=True)
+    weight = Column(Integer, default=0, nullable=False)
+
+class EngagementPrediction(Base):
+    """Cached LLM engagement scores for one version of a post (JSON in scores)"""
+    __tablename__ = "engagement_predictions"
+
+    content_hash = Column(String, primary_key=True)
+    scores = Column(Text, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+class DailyPostRollup(Base):
+    """Pre-aggregated post counts per day, source, keyword and status
+
+    keyword is '' on the per-source total row; status is 'total',
+    'approved' or 'posted' (a posted post also counts as approved).
+    """
+    __tablename__ = "daily_post_rollups"
+
+    day = Column(Date, primary_key=True)
+    source_blog = Column(String, primary_key=True)
+    keyword = Column(String, primary_key=True)
+    status = Column(String, primary_key=True)
+    post_count = Column(Integer, default=0, nullable=False)
+
+    __table_args__ = (
+        Index("ix_daily_post_rollups_status_keyword", "status", "keyword"),
+    )
+
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./blog_posts.db")
-engine = create_engine(DATABASE_URL)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+SQLITE_CACHE_SIZE_KB = int(os.getenv("SQLITE_CACHE_SIZE_KB", "20000"))
+
+def _configure_sqlite_connection(dbapi_connection, connection_record):
+    """Per-connection pragmas: WAL lets the UI read while a scanner writes"""
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute(f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}")
+    cursor.execute("PRAGMA synchronous=NORMAL")  # Safe with WAL, avoids an fsync per commit
+    cursor.execute(f"PRAGMA cache_size=-{SQLITE_CACHE_SIZE_KB}")
+    cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.close()
+
+def build_engine(database_url: str):
+    """Create an engine tuned for concurrent UI readers and background writers"""
+    url = make_url(database_url)
+
+    if url.get_backend_name() != "sqlite":
+        # Server databases handle concurrency themselves; just keep the pool healthy
+        return create_engine(
+            database_url,
+            pool_size=DB_POOL_SIZE,
+            max_overflow=DB_MAX_OVERFLOW,
+            pool_pre_ping=True,
+            pool_recycle=1800,
+        )
+
+    connect_args = {
+        "check_same_thread": False,  # Streamlit and worker threads share the pool
+        "timeout": SQLITE_BUSY_TIMEOUT_MS / 1000,
+    }
+    if url.database in (None, "", ":memory:"):
+        # One shared connection, otherwise every checkout sees an empty database
+        new_engine = create_engine(database_url, connect_args=connect_args, poolclass=StaticPool)
+    else:
+        new_engine = create_engine(
+            database_url,
+            connect_args=connect_args,
+            poolclass=QueuePool,
+            pool_size=DB_POOL_SIZE,
+            max_overflow=DB_MAX_OVERFLOW,
+        )
+    event.listen(new_engine, "connect", _configure_sqlite_connection)
+    return new_engine
+
+engine = build_engine(DATABASE_URL)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Write version - bumped after every session commit in this process that
+# wrote something, so read caches can key on it and drop their entries as
+# soon as anything changes. It moves only once the database commit is done
+# (a reader that sees the new version also sees the new rows), and commits
+# of read-only sessions leave it alone. Listening on the Session class also
+# covers the sync sessions inside async_db's AsyncSessions.
+_write_version = 0
+_write_version_lock = threading.Lock()
+
+def _mark_session_wrote(session, *args):
+    session.info['wrote'] = True
+
+def _mark_statement_wrote(orm_execute_state):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        _mark_session_wrote(orm_execute_state.session)
+
+def _forget_session_writes(session, *args):
+    session.info.pop('wrote', None)
+
+def _bump_write_version(session):
+    global _write_version
+    if session.info.pop('wrote', False):
+        with _write_version_lock:
+            _write_version += 1
+
+def get_write_version() -> int:
+    return _write_version
+
+event.listen(Session, "after_flush", _mark_session_wrote)
+event.listen(Session, "do_orm_execute", _mark_statement_wrote)
+event.listen(Session, "after_commit", _bump_write_version)
+event.listen(Session, "after_rollback", _forget_session_writes)
+
+def create_blog_post_indexes(bind):
+    """Create every index currently declared on BlogPost (benchmarks and tooling, never migrations)"""
+    for index in BlogPost.__table__.indexes:
+        index.create(bind=bind, checkfirst=True)
+
 def create_tables():
+    from migrations import run_migrations
+
     Base.metadata.create_all(bind=engine)
+    run_migrations(engine)
 
 def get_db():
     db = SessionLocal()
@@ -0,0 +1,162 @@
+# Near-duplicate detection - MinHash signatures with LSH banding
+import re
+import zlib
+from collections import defaultdict
+from typing import Dict, Hashable, List, Optional, Set, Tuple
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from models import BlogPost, PostSignature
+
+NUM_PERMUTATIONS = 128
+NUM_BANDS = 32
+
+# Universal hashing h(x) = (a*x + b) mod p over 32-bit token hashes.
+# p is the smallest prime above 2**32, so a*x + b always fits in uint64.
+# Seeds are fixed because signatures are persisted in the database.
+_PRIME = np.uint64(4294967311)
+_rng = np.random.RandomState(1337)
+_A = _rng.randint(1, 2**32 - 1, size=NUM_PERMUTATIONS, dtype=np.uint64)
+_B = _rng.randint(0, 2**32 - 1, size=NUM_PERMUTATIONS, dtype=np.uint64)
+
+
+def tokenize(text: str) -> Set[str]:
+    """Word set used for similarity (same tokens as calculate_content_similarity)"""
+    return set(re.findall(r'\w+', text.lower()))
+
+
+def minhash_signature(text: str) -> Optional[np.ndarray]:
+    """Compute the MinHash signature of a text, or None if it has no words"""
+    tokens = tokenize(text)
+    if not tokens:
+        return None
+
+    token_hashes = np.fromiter(
+        (zlib.crc32(token.encode('utf-8')) for token in tokens),
+        dtype=np.uint64,
+        count=len(tokens)
+    )
+    hashed = (np.outer(_A, token_hashes) + _B[:, None]) % _PRIME
+    return hashed.min(axis=1)
+
+
+def estimate_similarity(signature1: np.ndarray, signature2: np.ndarray) -> float:
+    """Estimate Jaccard similarity from two signatures (0-1 score)"""
+    return float(np.count_nonzero(signature1 == signature2)) / len(signature1)
+
+
+class NearDuplicateIndex:
+    """MinHash + LSH index answering "which stored texts look like this one?"
+
+    Each signature is split into bands; two texts become candidates when any
+    band matches exactly, so lookups cost O(bands) instead of O(n) comparisons.
+    Candidates are then verified against the estimated Jaccard similarity.
+    """
+
+    def __init__(self, num_bands: int = NUM_BANDS):
+        if NUM_PERMUTATIONS % num_bands:
+            raise ValueError("num_bands must divide the number of permutations")
+        self.num_bands = num_bands
+        self.rows_per_band = NUM_PERMUTATIONS // num_bands
+        self.signatures: Dict[Hashable, np.ndarray] = {}
+        self.buckets: Dict[Tuple[int, bytes], Set[Hashable]] = defaultdict(set)
+        self.unsignable_ids: Set[Hashable] = set()  # Synced posts without words (empty signature row)
+
+    def __len__(self) -> int:
+        return len(self.signatures)
+
+    def _band_keys(self, signature: np.ndarray) -> List[Tuple[int, bytes]]:
+        bands = signature.reshape(self.num_bands, self.rows_per_band)
+        return [(band, bands[band].tobytes()) for band in range(self.num_bands)]
+
+    def add(self, key: Hashable, signature: np.ndarray):
+        """Add a signature under the given key"""
+        if key in self.signatures:
+            self.remove(key)
+        self.signatures[key] = signature
+        for band_key in self._band_keys(signature):
+            self.buckets[band_key].add(key)
+
+    def remove(self, key: Hashable):
+        """Remove a key from the index (no-op if missing)"""
+        signature = self.signatures.pop(key, None)
+        if signature is None:
+            return
+        for band_key in self._band_keys(signature):
+            bucket = self.buckets.get(band_key)
+            if bucket is not None:
+                bucket.discard(key)
+                if not bucket:
+                    del self.buckets[band_key]
+
+    def query(self, signature: np.ndarray, similarity_threshold: float = 0.7) -> List[Tuple[Hashable, float]]:
+        """Return (key, similarity) pairs above the threshold, most similar first"""
+        candidates = set()
+        for band_key in self._band_keys(signature):
+            candidates.update(self.buckets.get(band_key, ()))
+
+        matches = []
+        for key in candidates:
+            similarity = estimate_similarity(signature, self.signatures[key])
+            if similarity > similarity_threshold:
+                matches.append((key, similarity))
+
+        return sorted(matches, key=lambda match: match[1], reverse=True)
+
+    def sync_with_database(self, db: Session):
+        """Bring the index in line with the blog_posts table.
+
+        Persisted signatures are loaded once, signatures for new or
+        rewritten posts are computed and stored, and entries for deleted
+        posts are dropped. Posts without any words get an empty signature
+        row so they are not re-read on every sync. Only ids are scanned on
+        each call, never the post text, and nothing is committed unless a
+        row changed.
+        """
+        current_ids = {post_id for (post_id,) in db.query(BlogPost.id)}
+
+        # Forget posts that were removed since the last sync
+        for key in [key for key in self.signatures if key not in current_ids]:
+            self.remove(key)
+        changed = db.query(PostSignature).filter(
+            ~PostSignature.post_id.in_(db.query(BlogPost.id))
+        ).delete(synchronize_session=False) > 0
+
+        # Forget signatures whose stored row was dropped because the text changed (upsert_posts)
+        stored_ids = {post_id for (post_id,) in db.query(PostSignature.post_id)}
+        for key in [key for key in self.signatures if key not in stored_ids]:
+            self.remove(key)
+        self.unsignable_ids &= stored_ids
+
+        # Load signatures persisted by earlier runs or other processes
+        unloaded_ids = current_ids - set(self.signatures) - self.unsignable_ids
+        if unloaded_ids & stored_ids:
+            stored = db.query(PostSignature.post_id, PostSignature.signature).yield_per(1000)
+            for post_id, blob in stored:
+                if post_id in unloaded_ids:
+                    if blob:
+                        self.add(post_id, np.frombuffer(blob, dtype=np.uint64))
+                    else:
+                        self.unsignable_ids.add(post_id)
+                    unloaded_ids.discard(post_id)
+
+        # Compute and persist signatures for posts that never had one
+        if unloaded_ids:
+            missing_posts = db.query(BlogPost.id, BlogPost.title, BlogPost.summary).outerjoin(
+                PostSignature, PostSignature.post_id == BlogPost.id
+            ).filter(PostSignature.post_id.is_(None)).yield_per(1000)
+            new_rows = []
+            for post_id, title, summary in missing_posts:
+                signature = minhash_signature((title or '') + ' ' + (summary or ''))
+                if signature is None:
+                    self.unsignable_ids.add(post_id)
+                    new_rows.append(PostSignature(post_id=post_id, signature=b''))
+                    continue
+                self.add(post_id, signature)
+                new_rows.append(PostSignature(post_id=post_id, signature=signature.tobytes()))
+            db.add_all(new_rows)
+            changed = changed or bool(new_rows)
+
+        if changed:
+            db.commit()
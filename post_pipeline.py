@@ -0,0 +1,196 @@
+# Post pipeline - the scan hot path shared by the Dashboard, date search and CLI
+#
+#   fetch -> select (story dedup, per-source cap) -> content -> summarize -> generate
+#
+# Each stage runs over the whole batch with its own worker pool, keeps input
+# order and records wall time, items in/out and errors, so the slow stage
+# shows up in the numbers instead of being guessed at.
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Set
+
+from config import PIPELINE_MAX_POSTS_PER_SOURCE, PIPELINE_STAGE_WORKERS
+from story_clustering import select_story_representatives
+
+
+class PipelineCancelled(Exception):
+    """Raised out of a scan once its cancel_event is set"""
+
+
+class PostPipeline:
+    """Turns feed items into fresh post candidates (title, summary, LinkedIn post)
+
+    Optional hooks: known_urls(urls) returns the URLs that are already
+    stored so select drops them before any fetch or LLM call;
+    progress(stage, done, total) after every feed and processed item;
+    on_result(post) as soon as a post is generated; cancel_event to stop
+    between items. progress and on_result run concurrently on the stage's
+    worker threads, so done counts can arrive slightly out of order.
+    """
+
+    def __init__(self, blog_monitor, ai_summarizer, stage_workers: Optional[Dict[str, int]] = None,
+                 max_posts_per_source: int = PIPELINE_MAX_POSTS_PER_SOURCE,
+                 known_urls: Optional[Callable[[List[str]], Set[str]]] = None,
+                 progress: Optional[Callable[[str, int, int], None]] = None,
+                 on_result: Optional[Callable[[Dict], None]] = None,
+                 cancel_event: Optional[threading.Event] = None):
+        self.blog_monitor = blog_monitor
+        self.ai_summarizer = ai_summarizer
+        self.stage_workers = {**PIPELINE_STAGE_WORKERS, **(stage_workers or {})}
+        self.max_posts_per_source = max_posts_per_source
+        self.known_urls = known_urls
+        self.progress = progress
+        self.on_result = on_result
+        self.cancel_event = cancel_event
+        self.stages = [
+            ('content', self._resolve_content),
+            ('summarize', self._summarize),
+            ('generate', self._generate),
+        ]
+        self.stage_stats: Dict[str, Dict] = {}
+        self.prefilter_stats = Counter()
+        self._stats_lock = threading.Lock()
+
+    def scan_recent(self, blog_urls: List[str]) -> List[Dict]:
+        """Latest posts from the monitored blogs"""
+        return self._scan(lambda: self.blog_monitor.fetch_blog_posts(blog_urls, self._feed_progress))
+
+    def scan_by_date(self, blog_urls: List[str], target_date: datetime, days_range: int) -> List[Dict]:
+        """Posts from the days_range days up to target_date"""
+        return self._scan(lambda: self.blog_monitor.fetch_posts_by_date(
+            blog_urls, target_date, days_range, self._feed_progress
+        ))
+
+    def run(self, posts: List[Dict]) -> List[Dict]:
+        """Process already fetched feed items through select and the worker stages"""
+        self.stage_stats = {}
+        self.prefilter_stats = Counter()
+
+        start = time.perf_counter()
+        items = self.select(posts)
+        self._record('select', len(posts), len(items), 0, start)
+
+        for name, stage in self.stages:
+            items = self._run_stage(name, stage, items)
+            self._check_cancelled()
+        return items
+
+    def select(self, posts: List[Dict]) -> List[Dict]:
+        """Collapse copies of the same story, drop stored URLs, then keep the first items of each source"""
+        stories = select_story_representatives(posts)
+        known = self.known_urls([post_data['url'] for post_data in stories]) if self.known_urls else set()
+
+        per_source = Counter()
+        selected = []
+        for post_data in stories:
+            if post_data['url'] in known:
+                continue
+            source = post_data['source_blog']
+            if per_source[source] < self.max_posts_per_source:
+                per_source[source] += 1
+                selected.append(post_data)
+        return selected
+
+    def report(self) -> str:
+        """One-line timing summary, e.g. 'content 3.10s (6/8) | summarize 5.02s (6/6)'"""
+        return ' | '.join(
+            f"{name} {stats['seconds']:.2f}s ({stats['items_out']}/{stats['items_in']}"
+            + (f", {stats['errors']} errors" if stats['errors'] else '') + ')'
+            for name, stats in self.stage_stats.items()
+        )
+
+    def _scan(self, fetch: Callable[[], List[Dict]]) -> List[Dict]:
+        start = time.perf_counter()
+        posts = fetch()
+        fetch_seconds = time.perf_counter() - start
+
+        fetch_stats = {'items_in': 0, 'items_out': len(posts), 'errors': 0, 'seconds': fetch_seconds}
+        try:
+            return self.run(posts)
+        finally:
+            self.stage_stats = {'fetch': fetch_stats, **self.stage_stats}
+
+    def _run_stage(self, name: str, stage: Callable[[Dict], Optional[Dict]], items: List[Dict]) -> List[Dict]:
+        last_stage = name == self.stages[-1][0]
+        done = 0
+
+        def run_item(item):
+            nonlocal done
+            if self._cancelled():
+                return None, False
+            try:
+                result, failed = stage(item), False
+            except Exception as e:
+                print(f"Error in {name} stage for {item.get('url')}: {e}")
+                result, failed = None, True
+
+            with self._stats_lock:
+                done += 1
+                completed = done
+            # Callbacks may be slow (on_result writes to the database), keep them off the lock
+            if self.progress:
+                self.progress(name, completed, len(items))
+            if last_stage and result is not None and self.on_result:
+                self.on_result(result)
+            return result, failed
+
+        start = time.perf_counter()
+        workers = max(1, min(self.stage_workers.get(name, 1), len(items)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"pipeline-{name}") as executor:
+            results = list(executor.map(run_item, items))
+
+        output = [result for result, _ in results if result is not None]
+        self._record(name, len(items), len(output), sum(failed for _, failed in results), start)
+        return output
+
+    def _cancelled(self) -> bool:
+        return self.cancel_event is not None and self.cancel_event.is_set()
+
+    def _check_cancelled(self):
+        if self._cancelled():
+            raise PipelineCancelled()
+
+    def _feed_progress(self, feeds_done: int, feeds_total: int):
+        if self.progress:
+            self.progress('fetch', feeds_done, feeds_total)
+        self._check_cancelled()
+
+    def _record(self, name: str, items_in: int, items_out: int, errors: int, start: float):
+        self.stage_stats[name] = {
+            'items_in': items_in,
+            'items_out': items_out,
+            'errors': errors,
+            'seconds': time.perf_counter() - start,
+        }
+
+    # Stages - each takes one item and returns the enriched item, or None to drop it
+
+    def _resolve_content(self, post_data: Dict) -> Optional[Dict]:
+        stats = Counter()
+        full_content, keywords = self.blog_monitor.resolve_content(post_data, stats)
+        with self._stats_lock:
+            self.prefilter_stats.update(stats)
+        if not keywords:
+            return None
+        return {**post_data, 'full_content': full_content, 'keyword_list': keywords}
+
+    def _summarize(self, item: Dict) -> Dict:
+        return {**item, 'summary': self.ai_summarizer.summarize_content(item['title'], item['full_content'])}
+
+    def _generate(self, item: Dict) -> Dict:
+        linkedin_post = self.ai_summarizer.generate_linkedin_post(
+            item['title'], item['summary'], item['url'], item['keyword_list']
+        )
+        return {
+            'title': item['title'],
+            'url': item['url'],
+            'summary': item['summary'],
+            'linkedin_post': linkedin_post,
+            'source_blog': item['source_blog'],
+            'keywords': ', '.join(item['keyword_list']),
+            'content': item['full_content'],
+            'story_sources': item.get('story_sources', [])
+        }
@@ -0,0 +1,344 @@
+# Post repository - the queries the Streamlit pages run against blog_posts
+import json
+import re
+from datetime import datetime
+from typing import List, Optional, Set, Tuple
+
+from sqlalchemy import and_, or_, text
+from sqlalchemy.orm import Session
+
+from models import ArchivedPost, BlogPost, Keyword, PostSignature, post_keywords, split_keywords
+from analytics_rollup import apply_rollup_delta, post_statuses
+
+# Keyset cursor: (created_at, id) of the last row on the previous page
+PageCursor = Tuple[datetime, int]
+
+
+def _approved_query(db: Session, keyword: Optional[str] = None):
+    query = db.query(BlogPost).filter(BlogPost.is_approved == True)
+    if keyword:
+        query = query.join(post_keywords, post_keywords.c.post_id == BlogPost.id).join(
+            Keyword, Keyword.id == post_keywords.c.keyword_id
+        ).filter(Keyword.name == keyword)
+    return query
+
+
+def count_approved(db: Session, keyword: Optional[str] = None) -> int:
+    return _approved_query(db, keyword).count()
+
+
+def get_approved_page(db: Session, page_size: int, after: Optional[PageCursor] = None,
+                      keyword: Optional[str] = None) -> Tuple[List[BlogPost], Optional[PageCursor]]:
+    """One page of approved posts, newest first, optionally for one keyword
+
+    Seeks past the cursor instead of using OFFSET, so every page costs the
+    same index range scan no matter how deep it is. Returns the rows and
+    the cursor for the next page (None on the last page).
+    """
+    query = _approved_query(db, keyword)
+    if after is not None:
+        created_at, post_id = after
+        query = query.filter(or_(
+            BlogPost.created_at < created_at,
+            and_(BlogPost.created_at == created_at, BlogPost.id < post_id)
+        ))
+
+    rows = query.order_by(BlogPost.created_at.desc(), BlogPost.id.desc()).limit(page_size + 1).all()
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        return rows, (rows[-1].created_at, rows[-1].id)
+    return rows, None
+
+
+def _fts_query(search: str) -> str:
+    """Quote each word so user input can't break FTS5 syntax; last word is a prefix"""
+    terms = re.findall(r'\w+', search)
+    return ' '.join(f'"{term}"' for term in terms[:-1]) + (f' "{terms[-1]}"*' if terms else '')
+
+
+def search_approved_posts(db: Session, search: str, limit: int = 20) -> List[BlogPost]:
+    """Approved posts matching a full-text search, best BM25 match first"""
+    fts_query = _fts_query(search)
+    if not fts_query:
+        return []
+
+    if db.get_bind().dialect.name != "sqlite":
+        pattern = f"%{search.strip()}%"
+        return _approved_query(db).filter(or_(
+            BlogPost.title.ilike(pattern), BlogPost.summary.ilike(pattern), BlogPost.linkedin_post.ilike(pattern)
+        )).order_by(BlogPost.created_at.desc()).limit(limit).all()
+
+    # CROSS JOIN keeps the FTS table as the outer loop; otherwise SQLite may
+    # walk blog_posts and evaluate MATCH once per row
+    ranked_ids = [post_id for (post_id,) in db.execute(text("""
+        SELECT blog_posts.id FROM blog_posts_fts
+        CROSS JOIN blog_posts ON blog_posts.id = blog_posts_fts.rowid
+        WHERE blog_posts_fts MATCH :query AND blog_posts.is_approved = 1
+        ORDER BY bm25(blog_posts_fts, 10.0, 3.0, 1.0)
+        LIMIT :limit
+    """), {"query": fts_query, "limit": limit})]
+
+    posts = {post.id: post for post in db.query(BlogPost).filter(BlogPost.id.in_(ranked_ids))}
+    return [posts[post_id] for post_id in ranked_ids if post_id in posts]
+
+
+def get_keyword_names(db: Session) -> List[str]:
+    return [name for (name,) in db.query(Keyword.name).order_by(Keyword.name)]
+
+
+def get_or_create_keywords(db: Session, names: List[str]) -> List[Keyword]:
+    existing = {keyword.name: keyword for keyword in db.query(Keyword).filter(Keyword.name.in_(names))}
+    for name in names:
+        if name not in existing:
+            existing[name] = Keyword(name=name)
+            db.add(existing[name])
+    return [existing[name] for name in names]
+
+
+def set_post_keywords(db: Session, post: BlogPost, keywords_matched: Optional[str]):
+    """Point the post's keyword associations at keywords_matched"""
+    post.keywords = get_or_create_keywords(db, split_keywords(keywords_matched))
+
+
+def _dialect_insert(db: Session):
+    """insert() with ON CONFLICT support, None for dialects without it"""
+    dialect = db.get_bind().dialect.name
+    if dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    elif dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        return None
+    return insert(BlogPost.__table__)
+
+
+def _insert_ignoring_duplicates(db: Session):
+    """INSERT ... ON CONFLICT DO NOTHING for dialects that support it"""
+    statement = _dialect_insert(db)
+    return statement.on_conflict_do_nothing(index_elements=['url']) if statement is not None else None
+
+
+def upsert_posts(db: Session, rows: List[dict]) -> int:
+    """Insert or overwrite posts by URL (import path, caller commits)
+
+    rows are blog_posts column dicts without id; a row may leave columns
+    out, existing values are kept for those. Keyword associations are
+    rewritten for rows that carry keywords_matched. MinHash signatures of
+    the affected posts are dropped (title/summary may have changed), so the
+    next NearDuplicateIndex.sync_with_database recomputes them. Rollups are
+    not touched, callers rebuild them once after the whole import.
+    """
+    statement = _dialect_insert(db)
+    if statement is None:
+        raise ValueError(f"Upserts are not supported on {db.get_bind().dialect.name}")
+    if not rows:
+        return 0
+
+    rows = list({row['url']: row for row in rows}.values())  # one row per URL, last one wins
+    # One statement per column set, a row only overwrites the columns it carries
+    rows_by_columns = {}
+    for row in rows:
+        rows_by_columns.setdefault(tuple(sorted(row)), []).append(row)
+    post_ids = {}
+    for columns, column_rows in rows_by_columns.items():
+        upsert = statement.on_conflict_do_update(
+            index_elements=['url'],
+            set_={name: statement.excluded[name] for name in columns if name != 'url'}
+        )
+        post_ids.update({url: post_id for post_id, url in
+                         db.execute(upsert.returning(BlogPost.id, BlogPost.url), column_rows)})
+
+    names = {row['url']: split_keywords(row['keywords_matched']) for row in rows if 'keywords_matched' in row}
+    keywords = get_or_create_keywords(db, sorted({name for row_names in names.values() for name in row_names}))
+    db.flush()
+    keyword_ids = {keyword.name: keyword.id for keyword in keywords}
+
+    db.execute(PostSignature.__table__.delete().where(PostSignature.post_id.in_(list(post_ids.values()))))
+    db.execute(post_keywords.delete().where(post_keywords.c.post_id.in_([post_ids[url] for url in names])))
+    associations = [
+        {'post_id': post_ids[url], 'keyword_id': keyword_ids[name]}
+        for url, row_names in names.items() for name in row_names
+    ]
+    if associations:
+        db.execute(post_keywords.insert(), associations)
+    return len(post_ids)
+
+
+def _insert_posts(db: Session, posts: List[dict], status: str) -> List[BlogPost]:
+    created_at = datetime.utcnow()
+    rows, seen = [], set()
+    for post in posts:
+        if post['url'] in seen:
+            continue
+        seen.add(post['url'])
+        rows.append({
+            'title': post['title'],
+            'url': post['url'],
+            'summary': post['summary'],
+            'linkedin_post': post['linkedin_post'],
+            'source_blog': post['source_blog'],
+            'keywords_matched': post['keywords'],
+            'content': post.get('content'),
+            'story_sources': json.dumps(post['story_sources']) if post.get('story_sources') else None,
+            'created_at': created_at,
+            'status': status,
+            'is_approved': status == 'approved',
+            'is_posted': False,
+        })
+    # Archived URLs count as stored too, otherwise a rescan would bring them back
+    archived = {url for (url,) in db.query(ArchivedPost.url).filter(ArchivedPost.url.in_(seen))}
+    rows = [row for row in rows if row['url'] not in archived]
+    if not rows:
+        return []
+
+    statement = _insert_ignoring_duplicates(db)
+    if statement is not None:
+        inserted_ids = [post_id for (post_id,) in db.execute(statement.returning(BlogPost.id), rows)]
+    else:
+        stored = {url for (url,) in db.query(BlogPost.url).filter(BlogPost.url.in_(seen))}
+        rows = [row for row in rows if row['url'] not in stored]
+        inserted_ids = [db.execute(BlogPost.__table__.insert().values(**row)).inserted_primary_key[0] for row in rows]
+
+    added = db.query(BlogPost).filter(BlogPost.id.in_(inserted_ids)).all() if inserted_ids else []
+    for post in added:
+        set_post_keywords(db, post, post.keywords_matched)
+        apply_rollup_delta(db, post.created_at, post.source_blog, post.keywords_matched,
+                           post_statuses(post.is_approved, False), 1)
+    db.commit()
+    return added
+
+
+def add_approved_posts(db: Session, posts: List[dict]) -> List[BlogPost]:
+    """Save many approved posts in one transaction, skipping stored URLs
+
+    Each dict carries title, url, summary, linkedin_post, source_blog,
+    keywords and optionally the extracted article content. Rows go in as a
+    single INSERT ... ON CONFLICT(url) DO NOTHING, so duplicates cost
+    nothing and nothing is committed until the keyword associations and
+    rollups for the new rows are written too. Returns the posts that were
+    actually inserted.
+    """
+    return _insert_posts(db, posts, 'approved')
+
+
+def save_candidates(db: Session, posts: List[dict]) -> List[BlogPost]:
+    """Store scan results for review (same dicts and rules as add_approved_posts)"""
+    return _insert_posts(db, posts, 'candidate')
+
+
+def get_stored_urls(db: Session, urls: List[str]) -> Set[str]:
+    """The URLs that already have a row (any status, or archived)"""
+    if not urls:
+        return set()
+    stored = {url for (url,) in db.query(BlogPost.url).filter(BlogPost.url.in_(urls))}
+    return stored | {url for (url,) in db.query(ArchivedPost.url).filter(ArchivedPost.url.in_(urls))}
+
+
+def get_candidates(db: Session, limit: int = 50) -> List[BlogPost]:
+    """Scan results awaiting review, newest first"""
+    return db.query(BlogPost).filter(BlogPost.status == 'candidate').order_by(
+        BlogPost.created_at.desc(), BlogPost.id.desc()
+    ).limit(limit).all()
+
+
+def approve_candidates(db: Session, post_ids: List[int]) -> List[BlogPost]:
+    """Flip candidates to approved in one transaction, returns the posts that changed"""
+    if not post_ids:
+        return []
+    posts = db.query(BlogPost).filter(BlogPost.id.in_(post_ids), BlogPost.status == 'candidate').all()
+    for post in posts:
+        post.status = 'approved'
+        post.is_approved = True
+        apply_rollup_delta(db, post.created_at, post.source_blog, post.keywords_matched, ['approved'], 1)
+    db.commit()
+    return posts
+
+
+def dismiss_candidates(db: Session, post_ids: List[int]) -> int:
+    """Hide candidates from review; the row stays so later scans skip the URL"""
+    if not post_ids:
+        return 0
+    dismissed = db.query(BlogPost).filter(BlogPost.id.in_(post_ids), BlogPost.status == 'candidate').update(
+        {BlogPost.status: 'dismissed'}, synchronize_session=False
+    )
+    db.commit()
+    return dismissed
+
+
+def add_approved_post(db: Session, title: str, url: str, summary: str, linkedin_post: str,
+                      source_blog: str, keywords_matched: str, content: Optional[str] = None) -> Optional[BlogPost]:
+    """Save a new approved post, returns None if the URL is already stored"""
+    added = add_approved_posts(db, [{
+        'title': title,
+        'url': url,
+        'summary': summary,
+        'linkedin_post': linkedin_post,
+        'source_blog': source_blog,
+        'keywords': keywords_matched,
+        'content': content,
+    }])
+    return added[0] if added else None
+
+
+def mark_posted(db: Session, post_id: int) -> Optional[BlogPost]:
+    post = db.query(BlogPost).filter(BlogPost.id == post_id).first()
+    if post and not post.is_posted:
+        post.is_posted = True
+        apply_rollup_delta(db, post.created_at, post.source_blog, post.keywords_matched, ['posted'], 1)
+        db.commit()
+    return post
+
+
+def get_post_content(db: Session, post_id: int) -> Optional[str]:
+    """Stored article text of a post (the only query that loads the deferred column)"""
+    row = db.query(BlogPost.content).filter(BlogPost.id == post_id).first()
+    return row[0] if row else None
+
+
+def save_post_content(db: Session, post_id: int, content: str):
+    db.query(BlogPost).filter(BlogPost.id == post_id).update({BlogPost.content: content}, synchronize_session=False)
+    db.commit()
+
+
+def update_linkedin_post(db: Session, post_id: int, linkedin_post: str) -> Optional[BlogPost]:
+    post = db.query(BlogPost).filter(BlogPost.id == post_id).first()
+    if post:
+        post.linkedin_post = linkedin_post
+        db.commit()
+    return post
+
+
+def remove_post(db: Session, post_id: int) -> Optional[BlogPost]:
+    """Delete a post, returns the deleted row (detached) or None"""
+    post = db.query(BlogPost).filter(BlogPost.id == post_id).first()
+    if post:
+        apply_rollup_delta(db, post.created_at, post.source_blog, post.keywords_matched,
+                           post_statuses(post.is_approved, post.is_posted), -1)
+        db.delete(post)
+        db.commit()
+    return post
+
+
+def mark_posts_posted(db: Session, post_ids: List[int]) -> List[BlogPost]:
+    """Mark a selection as posted in one transaction, returns the posts that changed"""
+    if not post_ids:
+        return []
+    posts = db.query(BlogPost).filter(BlogPost.id.in_(post_ids), BlogPost.is_posted == False).all()
+    for post in posts:
+        post.is_posted = True
+        apply_rollup_delta(db, post.created_at, post.source_blog, post.keywords_matched, ['posted'], 1)
+    db.commit()
+    return posts
+
+
+def remove_posts(db: Session, post_ids: List[int]) -> List[BlogPost]:
+    """Delete a selection in one transaction, returns the deleted rows (detached)"""
+    if not post_ids:
+        return []
+    posts = db.query(BlogPost).filter(BlogPost.id.in_(post_ids)).all()
+    for post in posts:
+        apply_rollup_delta(db, post.created_at, post.source_blog, post.keywords_matched,
+                           post_statuses(post.is_approved, post.is_posted), -1)
+        db.delete(post)
+    db.commit()
+    return posts
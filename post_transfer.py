@@ -0,0 +1,124 @@
+# Post transfer - streaming export/import of blog_posts as JSONL or Parquet
+#
+# Rows move in fixed-size chunks in both directions (server-side cursor on
+# export, one upsert per chunk on import), so memory stays flat no matter
+# how many posts the database or the file holds.
+import json
+from datetime import datetime
+from typing import Dict, Iterator, List
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from models import BlogPost
+from analytics_rollup import rebuild_rollups
+from post_repository import upsert_posts
+
+EXPORT_COLUMNS = ['title', 'url', 'content', 'summary', 'linkedin_post', 'source_blog',
+                  'keywords_matched', 'created_at', 'is_posted', 'is_approved', 'status', 'story_sources']
+DEFAULT_CHUNK_SIZE = 1000
+
+
+def _format(path: str) -> str:
+    if path.endswith('.jsonl'):
+        return 'jsonl'
+    if path.endswith('.parquet'):
+        return 'parquet'
+    raise ValueError(f"Unknown file type for {path} (use .jsonl or .parquet)")
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise ImportError("Parquet export/import needs pyarrow: pip install pyarrow")
+    return pyarrow
+
+
+def _parquet_schema(pa):
+    return pa.schema([
+        (name, pa.timestamp('us') if name == 'created_at' else pa.bool_() if name.startswith('is_') else pa.string())
+        for name in EXPORT_COLUMNS
+    ])
+
+
+def iter_post_chunks(db: Session, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[List[Dict]]:
+    """blog_posts rows as column dicts, chunk_size at a time, oldest first"""
+    columns = [BlogPost.__table__.c[name] for name in EXPORT_COLUMNS]
+    result = db.execute(
+        select(*columns).order_by(BlogPost.id).execution_options(yield_per=chunk_size)
+    )
+    for partition in result.mappings().partitions():
+        yield [dict(row) for row in partition]
+
+
+def export_posts(db: Session, path: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> int:
+    """Write every post to a .jsonl or .parquet file, returns rows written"""
+    file_format = _format(path)
+    written = 0
+
+    if file_format == 'jsonl':
+        with open(path, 'w', encoding='utf-8') as output:
+            for chunk in iter_post_chunks(db, chunk_size):
+                for row in chunk:
+                    row['created_at'] = row['created_at'].isoformat() if row['created_at'] else None
+                    output.write(json.dumps(row, ensure_ascii=False) + '\n')
+                written += len(chunk)
+        return written
+
+    pa = _pyarrow()
+    schema = _parquet_schema(pa)
+    with pa.parquet.ParquetWriter(path, schema, compression='zstd') as writer:
+        for chunk in iter_post_chunks(db, chunk_size):
+            writer.write_table(pa.Table.from_pylist(chunk, schema=schema))  # one row group per chunk
+            written += len(chunk)
+    return written
+
+
+def _read_chunks(path: str, chunk_size: int) -> Iterator[List[Dict]]:
+    if _format(path) == 'jsonl':
+        chunk = []
+        with open(path, encoding='utf-8') as source:
+            for line in source:
+                if line.strip():
+                    chunk.append(json.loads(line))
+                if len(chunk) >= chunk_size:
+                    yield chunk
+                    chunk = []
+        if chunk:
+            yield chunk
+        return
+
+    pa = _pyarrow()
+    for batch in pa.parquet.ParquetFile(path).iter_batches(batch_size=chunk_size):
+        yield batch.to_pylist()
+
+
+def _to_row(record: Dict) -> Dict:
+    """File record -> blog_posts column dict (missing columns get defaults)"""
+    row = {name: record.get(name) for name in EXPORT_COLUMNS}
+    created_at = row['created_at']
+    if isinstance(created_at, str):
+        row['created_at'] = datetime.fromisoformat(created_at)
+    row['created_at'] = row['created_at'] or datetime.utcnow()
+    row['is_posted'] = bool(row['is_posted'])
+    row['is_approved'] = bool(row['is_approved'])
+    row['status'] = row['status'] or ('approved' if row['is_approved'] else 'dismissed')  # exports before status existed
+    return row
+
+
+def import_posts(db: Session, path: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> int:
+    """Upsert every post of a .jsonl or .parquet export by URL, returns rows imported
+
+    Each chunk is one upsert and one commit. Rollups are rebuilt once at
+    the end; the full-text index follows through its triggers.
+    """
+    imported = 0
+    for chunk in _read_chunks(path, chunk_size):
+        imported += upsert_posts(db, [_to_row(record) for record in chunk if record.get('url')])
+        db.commit()
+
+    if imported:
+        rebuild_rollups(db)
+    return imported
@@ -0,0 +1,67 @@
+# User preference store - persisted feature weights updated per user action
+from collections import Counter
+from typing import Dict, Iterable, Tuple
+
+from sqlalchemy import case, func
+from sqlalchemy.orm import Session
+
+from models import BlogPost, Keyword, UserPreference, post_keywords
+from config import PREFERENCE_EVENT_WEIGHTS
+
+
+def apply_preference_events(db: Session, feature_lists: Iterable[Iterable[str]], event: str) -> Dict[str, int]:
+    """Apply one event for many posts in a single commit, returns the delta per feature"""
+    deltas: Dict[str, int] = Counter()
+    for features in feature_lists:
+        for feature in set(features):
+            deltas[feature] += PREFERENCE_EVENT_WEIGHTS[event]
+
+    for feature, delta in deltas.items():
+        updated = db.query(UserPreference).filter(
+            UserPreference.feature == feature
+        ).update({UserPreference.weight: UserPreference.weight + delta}, synchronize_session=False)
+        if not updated:
+            db.add(UserPreference(feature=feature, weight=delta))
+    db.commit()
+    return deltas
+
+
+def load_preferences(db: Session) -> Dict[str, int]:
+    """Snapshot of all feature weights"""
+    return {feature: weight for feature, weight in db.query(UserPreference.feature, UserPreference.weight)}
+
+
+def backfill_preferences(db: Session) -> Tuple[Dict[str, int], bool]:
+    """Feature weights, rebuilt once from approved/posted history when the table is empty
+
+    Returns (weights, backfilled). A backfill already counts every action
+    committed so far, so callers must not apply the event that triggered
+    it on top. Counts come straight from indexed GROUP BY queries over the
+    keyword association table and blog_posts; no post rows are loaded.
+    """
+    if db.query(UserPreference).first() is not None:
+        return load_preferences(db), False
+
+    approved_weight = PREFERENCE_EVENT_WEIGHTS['approved']
+    posted_weight = PREFERENCE_EVENT_WEIGHTS['posted']
+    posted_count = func.sum(case((BlogPost.is_posted == True, 1), else_=0))
+    weights: Dict[str, int] = {}
+
+    keyword_counts = db.query(Keyword.name, func.count(), posted_count).join(
+        post_keywords, post_keywords.c.keyword_id == Keyword.id
+    ).join(BlogPost, BlogPost.id == post_keywords.c.post_id).filter(
+        BlogPost.is_approved == True
+    ).group_by(Keyword.name)
+    for name, approved, posted in keyword_counts:
+        weights[name] = approved * approved_weight + (posted or 0) * posted_weight
+
+    source_counts = db.query(BlogPost.source_blog, func.count(), posted_count).filter(
+        BlogPost.is_approved == True, BlogPost.source_blog != None, BlogPost.source_blog != ''
+    ).group_by(BlogPost.source_blog)
+    for source, approved, posted in source_counts:
+        weights[f"source:{source}"] = approved * approved_weight + (posted or 0) * posted_weight
+
+    if weights:
+        db.add_all([UserPreference(feature=feature, weight=weight) for feature, weight in weights.items()])
+        db.commit()
+    return weights, True
@@ -0,0 +1,69 @@
+# Retention - move old blog_posts rows into blog_posts_archive and compact the database
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+
+from sqlalchemy import DateTime, literal, null, select, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from models import ArchivedPost, BlogPost
+from config import RETENTION_ARCHIVE_AFTER_DAYS, RETENTION_BATCH_SIZE
+
+ARCHIVED_COLUMNS = ['title', 'url', 'content', 'summary', 'linkedin_post', 'source_blog',
+                    'keywords_matched', 'created_at', 'is_posted', 'is_approved']
+TEXT_COLUMNS = {'content', 'summary', 'linkedin_post'}
+
+
+def archive_old_posts(db: Session, older_than_days: int = RETENTION_ARCHIVE_AFTER_DAYS,
+                      drop_text: bool = False, batch_size: int = RETENTION_BATCH_SIZE,
+                      now: Optional[datetime] = None) -> int:
+    """Move posts created before the cutoff to the archive, returns rows moved
+
+    Rows are copied with INSERT ... SELECT and deleted in batches, one
+    commit per batch. Keyword associations, signatures and the full-text
+    index follow the delete (FK cascades and triggers); daily rollups are
+    left alone so Analytics still covers archived history.
+    """
+    now = now or datetime.utcnow()
+    cutoff = now - timedelta(days=older_than_days)
+    posts = BlogPost.__table__
+    columns = [
+        null().label(name) if drop_text and name in TEXT_COLUMNS else posts.c[name]
+        for name in ARCHIVED_COLUMNS
+    ]
+
+    archived = 0
+    while True:
+        batch = [post_id for (post_id,) in db.query(BlogPost.id).filter(
+            BlogPost.created_at < cutoff
+        ).order_by(BlogPost.id).limit(batch_size)]
+        if not batch:
+            break
+
+        db.execute(ArchivedPost.__table__.insert().from_select(
+            ['post_id'] + ARCHIVED_COLUMNS + ['archived_at'],
+            select(posts.c.id, *columns, literal(now, DateTime)).where(posts.c.id.in_(batch))
+        ))
+        db.execute(posts.delete().where(posts.c.id.in_(batch)))
+        db.commit()
+        archived += len(batch)
+
+    return archived
+
+
+def compact_database(engine: Engine) -> Dict[str, Optional[int]]:
+    """VACUUM + ANALYZE, returns the SQLite file size before and after (None elsewhere)"""
+    sizes = {'before': None, 'after': None}
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+        if connection.dialect.name != "sqlite":
+            connection.execute(text("VACUUM ANALYZE"))
+            return sizes
+
+        size = "SELECT page_count * page_size FROM pragma_page_count(), pragma_page_size()"
+        sizes['before'] = connection.execute(text(size)).scalar()
+        connection.execute(text("VACUUM"))
+        connection.execute(text("ANALYZE"))
+        # Fold the WAL back into the main file so the space is really returned
+        connection.execute(text("PRAGMA wal_checkpoint(TRUNCATE)"))
+        sizes['after'] = connection.execute(text(size)).scalar()
+    return sizes
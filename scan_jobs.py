@@ -0,0 +1,210 @@
+# Background scan jobs - PostPipeline scans on worker threads with progress and cancellation
+#
+# The Streamlit script only submits a job and polls its state, so the page
+# stays responsive and a scan survives navigating to another page. Every
+# generated post is saved as a candidate right away, so all sessions see it.
+#
+# Identical scans are single-flight: submitting one while the same scan is
+# queued or running returns the existing job, and a finished date-range
+# search is served from its job for SCAN_JOB_CACHE_TTL_SECONDS.
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Callable, Dict, Hashable, List, Optional, Set
+
+from models import SessionLocal
+from config import SCAN_JOB_CACHE_TTL_SECONDS, SCAN_JOB_HISTORY, SCAN_JOB_WORKERS
+from post_pipeline import PipelineCancelled, PostPipeline
+from post_repository import get_stored_urls, save_candidates
+
+FINISHED_STATUSES = ('done', 'cancelled', 'failed')
+
+
+def stored_urls(urls: List[str]) -> Set[str]:
+    """PostPipeline known_urls hook: skip anything already in the candidate store"""
+    db = SessionLocal()
+    try:
+        return get_stored_urls(db, urls)
+    except Exception as e:
+        print(f"Error checking stored URLs: {e}")
+        return set()
+    finally:
+        db.close()
+
+
+def store_candidate(post: Dict, content_intelligence):
+    """PostPipeline on_result hook: persist a generated post for review
+
+    Ingestion is where a post counts towards the trending keyword buckets,
+    so a new candidate is recorded there right away (approval doesn't count
+    it again).
+    """
+    db = SessionLocal()
+    try:
+        saved = save_candidates(db, [post])
+    except Exception as e:
+        print(f"Error saving candidate {post.get('url')}: {e}")
+        return
+    finally:
+        db.close()
+    if saved:
+        content_intelligence.record_post_keywords(post)
+
+
+class ScanJob:
+    """State of one scan, updated by the worker thread and read by the UI"""
+
+    def __init__(self, description: str):
+        self.id = uuid.uuid4().hex[:8]
+        self.description = description
+        self.status = 'queued'  # queued -> running -> done / cancelled / failed
+        self.stage = None
+        self.stage_done = 0
+        self.stage_total = 0
+        self.feeds_done = 0
+        self.feeds_total = 0
+        self.posts: List[Dict] = []  # Generated posts, appended as they complete
+        self.prefilter_stats: Dict[str, int] = {}
+        self.report = ''
+        self.error = None
+        self.created_at = datetime.utcnow()
+        self.finished_at = None
+        self.cancel_event = threading.Event()
+        self._lock = threading.Lock()
+
+    @property
+    def finished(self) -> bool:
+        return self.status in FINISHED_STATUSES
+
+    def snapshot(self) -> Dict:
+        """Consistent copy of the job state for rendering"""
+        with self._lock:
+            return {
+                'id': self.id,
+                'description': self.description,
+                'status': self.status,
+                'stage': self.stage,
+                'stage_done': self.stage_done,
+                'stage_total': self.stage_total,
+                'feeds_done': self.feeds_done,
+                'feeds_total': self.feeds_total,
+                'posts': list(self.posts),
+                'prefilter_stats': dict(self.prefilter_stats),
+                'report': self.report,
+                'error': self.error,
+            }
+
+    def _progress(self, stage: str, done: int, total: int):
+        with self._lock:
+            if stage == self.stage and done < self.stage_done:
+                return  # A slower worker reporting an older count
+            if stage == 'fetch':
+                self.feeds_done, self.feeds_total = done, total
+            self.stage, self.stage_done, self.stage_total = stage, done, total
+
+    def _add_post(self, post: Dict):
+        with self._lock:
+            self.posts.append(post)
+
+
+class ScanJobManager:
+    """Runs scans on a small thread pool and keeps recent jobs by id"""
+
+    def __init__(self, blog_monitor, ai_summarizer, content_intelligence, max_workers: int = SCAN_JOB_WORKERS,
+                 history: int = SCAN_JOB_HISTORY, cache_ttl: int = SCAN_JOB_CACHE_TTL_SECONDS):
+        self.blog_monitor = blog_monitor
+        self.ai_summarizer = ai_summarizer
+        self.content_intelligence = content_intelligence
+        self.history = history
+        self.cache_ttl = cache_ttl
+        self.jobs: Dict[str, ScanJob] = {}
+        self._jobs_by_key: Dict[Hashable, ScanJob] = {}  # Latest job of each distinct scan
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="scan-job")
+
+    def submit_recent(self, blog_urls: List[str]) -> ScanJob:
+        """Scan the latest posts; joins an identical scan that is still in flight"""
+        key = ('recent', frozenset(blog_urls))
+        return self._submit(key, 0, "Latest posts", lambda pipeline: pipeline.scan_recent(blog_urls))
+
+    def submit_by_date(self, blog_urls: List[str], target_date: datetime, days_range: int) -> ScanJob:
+        """Scan a date range; joins an identical scan in flight or reuses one finished within cache_ttl"""
+        key = ('date', target_date.date(), days_range, frozenset(blog_urls))
+        description = f"Posts up to {target_date:%Y-%m-%d} ({days_range} days back)"
+        return self._submit(key, self.cache_ttl, description,
+                            lambda pipeline: pipeline.scan_by_date(blog_urls, target_date, days_range))
+
+    def get(self, job_id: Optional[str]) -> Optional[ScanJob]:
+        with self._lock:
+            return self.jobs.get(job_id)
+
+    def cancel(self, job_id: str) -> bool:
+        """Ask a job to stop; it finishes its in-flight items and keeps the posts made so far"""
+        job = self.get(job_id)
+        if job is None or job.finished:
+            return False
+        job.cancel_event.set()
+        with job._lock:
+            if job.status == 'queued':  # Never started - the worker will skip it
+                job.status = 'cancelled'
+                job.finished_at = datetime.utcnow()
+        return True
+
+    def _submit(self, key: Hashable, ttl: int, description: str,
+                scan: Callable[[PostPipeline], List[Dict]]) -> ScanJob:
+        with self._lock:
+            existing = self._jobs_by_key.get(key)
+            if existing is not None and self._reusable(existing, ttl):
+                return existing
+
+            job = ScanJob(description)
+            self.jobs[job.id] = job
+            self._jobs_by_key[key] = job
+            self._forget_old_jobs()
+        self._executor.submit(self._run, job, scan)
+        return job
+
+    def _reusable(self, job: ScanJob, ttl: int) -> bool:
+        """In flight (and not being cancelled), or finished successfully less than ttl seconds ago"""
+        if not job.finished:
+            return not job.cancel_event.is_set()
+        return (job.status == 'done' and job.finished_at is not None
+                and (datetime.utcnow() - job.finished_at).total_seconds() < ttl)
+
+    def _run(self, job: ScanJob, scan: Callable[[PostPipeline], List[Dict]]):
+        with job._lock:  # cancel() may have marked it cancelled meanwhile
+            if job.status != 'queued' or job.cancel_event.is_set():
+                return
+            job.status = 'running'
+
+        def on_result(post):
+            store_candidate(post, self.content_intelligence)
+            job._add_post(post)
+
+        pipeline = PostPipeline(self.blog_monitor, self.ai_summarizer, known_urls=stored_urls,
+                                progress=job._progress, on_result=on_result, cancel_event=job.cancel_event)
+        posts = None
+        try:
+            posts = scan(pipeline)
+            status = 'done'
+        except PipelineCancelled:
+            status = 'cancelled'
+        except Exception as e:
+            print(f"Error in scan job {job.id}: {e}")
+            job.error = str(e)
+            status = 'failed'
+
+        with job._lock:
+            if posts is not None:
+                job.posts = posts  # Feed order instead of completion order
+            job.prefilter_stats = dict(pipeline.prefilter_stats)
+            job.report = pipeline.report()
+            job.finished_at = datetime.utcnow()
+            job.status = status
+
+    def _forget_old_jobs(self):
+        finished = sorted((job for job in self.jobs.values() if job.finished), key=lambda job: job.created_at)
+        for job in finished[:max(0, len(finished) - self.history)]:
+            del self.jobs[job.id]
+        self._jobs_by_key = {key: job for key, job in self._jobs_by_key.items() if job.id in self.jobs}
@@ -0,0 +1,88 @@
+# Vectorized TF-IDF similarity - one sparse matrix per batch of posts
+import re
+from collections import Counter
+from typing import Dict, List
+
+import numpy as np
+import scipy.sparse as sp
+from scipy.sparse.csgraph import connected_components
+
+
+def post_text(post: Dict) -> str:
+    """Text used to compare posts (same fields as duplicate detection)"""
+    return (post.get('title') or '') + ' ' + (post.get('summary') or '')
+
+
+class TfidfEngine:
+    """TF-IDF vectors for a batch of texts with all-pairs cosine similarity.
+
+    Rows of ``vectors`` are L2-normalized, so cosine similarity is a single
+    sparse matrix product. Fit once per batch, then reuse the same vectors
+    for dedup, "similar to approved" checks and topic grouping.
+    """
+
+    def __init__(self):
+        self.vocabulary: Dict[str, int] = {}
+        self.idf = np.zeros(0)
+        self.vectors = sp.csr_matrix((0, 0))
+
+    def _count_matrix(self, texts: List[str], grow_vocabulary: bool) -> sp.csr_matrix:
+        rows, cols, counts = [], [], []
+        for row, text in enumerate(texts):
+            for term, count in Counter(re.findall(r'\w+', text.lower())).items():
+                col = self.vocabulary.get(term)
+                if col is None:
+                    if not grow_vocabulary:
+                        continue
+                    col = self.vocabulary[term] = len(self.vocabulary)
+                rows.append(row)
+                cols.append(col)
+                counts.append(count)
+
+        return sp.csr_matrix(
+            (np.asarray(counts, dtype=np.float64), (rows, cols)),
+            shape=(len(texts), len(self.vocabulary))
+        )
+
+    def _weight(self, counts: sp.csr_matrix) -> sp.csr_matrix:
+        weighted = sp.csr_matrix(counts.multiply(self.idf[np.newaxis, :]))
+        norms = np.sqrt(np.asarray(weighted.multiply(weighted).sum(axis=1)).ravel())
+        norms[norms == 0] = 1.0
+        return sp.csr_matrix(sp.diags(1.0 / norms) @ weighted)
+
+    def fit(self, texts: List[str]) -> "TfidfEngine":
+        """Build the vocabulary, IDF weights and vectors for a batch of texts"""
+        self.vocabulary = {}
+        counts = self._count_matrix(texts, grow_vocabulary=True)
+
+        # Smoothed IDF: terms that appear everywhere still keep a small weight
+        document_frequency = np.bincount(counts.indices, minlength=counts.shape[1])
+        self.idf = np.log((1 + len(texts)) / (1 + document_frequency)) + 1.0
+
+        self.vectors = self._weight(counts)
+        return self
+
+    def transform(self, texts: List[str]) -> sp.csr_matrix:
+        """Vectorize extra texts with the fitted vocabulary (unknown words are ignored)"""
+        return self._weight(self._count_matrix(texts, grow_vocabulary=False))
+
+    def vector(self, index: int) -> sp.csr_matrix:
+        """TF-IDF vector (1 x vocabulary) of the index-th fitted text"""
+        return self.vectors[index]
+
+    def pairwise_similarity(self) -> sp.csr_matrix:
+        """Sparse n x n cosine similarity matrix of the fitted texts (one product)"""
+        return sp.csr_matrix(self.vectors @ self.vectors.T)
+
+    def similarity_to(self, other_vectors: sp.csr_matrix) -> np.ndarray:
+        """Dense n x m cosine similarity between fitted texts and other vectors"""
+        return (self.vectors @ other_vectors.T).toarray()
+
+    def group_labels(self, similarity_threshold: float) -> np.ndarray:
+        """Label fitted texts so that texts linked above the threshold share a label"""
+        if self.vectors.shape[0] == 0:
+            return np.zeros(0, dtype=np.int32)
+        # Thresholding the sparse product keeps memory proportional to the linked pairs
+        adjacency = self.pairwise_similarity() > similarity_threshold
+        _, labels = connected_components(adjacency, directed=False)
+        return labels
@@ -0,0 +1,93 @@
+# Story clustering - SimHash fingerprints over title + RSS summary
+import hashlib
+import re
+from typing import Dict, List
+
+from config import STORY_SIMHASH_MAX_DISTANCE
+
+FINGERPRINT_BITS = 64
+
+# Words that carry no information about which story an item covers
+STOP_WORDS = {
+    'the', 'and', 'for', 'with', 'that', 'this', 'from', 'are', 'was', 'has',
+    'have', 'its', 'into', 'our', 'your', 'their', 'about', 'new', 'how', 'what',
+    'will', 'can', 'now', 'more', 'than', 'just', 'you', 'they', 'but', 'not',
+}
+
+
+def _token_hash(token: str) -> int:
+    return int.from_bytes(hashlib.blake2b(token.encode('utf-8'), digest_size=8).digest(), 'big')
+
+
+def simhash(text: str) -> int:
+    """64-bit SimHash fingerprint; similar texts differ in few bits"""
+    tokens = {
+        token for token in re.findall(r'\w+', text.lower())
+        if len(token) > 2 and token not in STOP_WORDS
+    }
+    if not tokens:
+        return 0
+
+    weights = [0] * FINGERPRINT_BITS
+    for token in tokens:
+        token_hash = _token_hash(token)
+        for bit in range(FINGERPRINT_BITS):
+            weights[bit] += 1 if token_hash >> bit & 1 else -1
+
+    fingerprint = 0
+    for bit, weight in enumerate(weights):
+        if weight > 0:
+            fingerprint |= 1 << bit
+    return fingerprint
+
+
+def hamming_distance(fingerprint1: int, fingerprint2: int) -> int:
+    return bin(fingerprint1 ^ fingerprint2).count('1')
+
+
+def cluster_stories(posts: List[Dict], max_distance: int = STORY_SIMHASH_MAX_DISTANCE) -> List[List[Dict]]:
+    """Group fetched items that cover the same story
+
+    Uses the title and the RSS/NewsAPI summary ('content' right after
+    fetching), so no page has to be downloaded. A scan returns at most a
+    few hundred items, so comparing fingerprints pairwise is cheap.
+    """
+    fingerprints = [simhash(post.get('title', '') + ' ' + (post.get('content') or '')) for post in posts]
+
+    # Union-find over items whose fingerprints are close enough
+    parent = list(range(len(posts)))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for i in range(len(posts)):
+        if not fingerprints[i]:
+            continue
+        for j in range(i + 1, len(posts)):
+            if fingerprints[j] and hamming_distance(fingerprints[i], fingerprints[j]) <= max_distance:
+                parent[find(j)] = find(i)
+
+    stories: Dict[int, List[Dict]] = {}
+    for i, post in enumerate(posts):
+        stories.setdefault(find(i), []).append(post)
+    return list(stories.values())
+
+
+def _representative_rank(post: Dict):
+    # Prefer the original blog over news aggregators, then the richest summary
+    is_aggregator = post.get('source_blog', '').startswith('NewsAPI')
+    return (is_aggregator, -len(post.get('content') or ''))
+
+
+def select_story_representatives(posts: List[Dict]) -> List[Dict]:
+    """One item per story, annotated with the other sources that covered it"""
+    representatives = []
+    for story in cluster_stories(posts):
+        representative = min(story, key=_representative_rank)
+        representative['story_sources'] = sorted({post.get('source_blog', '') for post in story})
+        representative['story_size'] = len(story)
+        representatives.append(representative)
+    return representatives
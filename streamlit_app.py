@@ -1,36 +1,478 @@
 import streamlit as st
 import pandas as pd
 from datetime import datetime, timedelta
+import json
 from sqlalchemy.orm import Session
 import requests
-import time
 
 # Import existing modules
-from models import BlogPost, get_db, create_tables
+from models import BlogPost, get_db, get_write_version, create_tables, split_keywords
 from blog_monitor import BlogMonitor
 from ai_summarizer import AISummarizer
 from content_intelligence import ContentIntelligence
-from config import BLOG_URLS, AI_KEYWORDS
+from scan_jobs import ScanJobManager
+from post_repository import (
+    count_approved, get_approved_page, get_keyword_names, search_approved_posts,
+    add_approved_post, mark_posted, mark_posts_posted, update_linkedin_post,
+    remove_post, remove_posts, get_post_content, save_post_content,
+    get_candidates, approve_candidates, dismiss_candidates
+)
+from analytics_rollup import get_status_totals, get_source_counts, get_keyword_counts
+from config import (
+    BLOG_URLS, AI_KEYWORDS, UI_CARD_BATCH_SIZE, UI_READ_CACHE_TTL_SECONDS, UI_READ_CACHE_MAX_ENTRIES,
+    REVIEW_SIMILAR_APPROVED_LOOKBACK
+)
+
+# Initialize the schema once per process, not on every rerun
+@st.cache_resource
+def init_database():
+    create_tables()
 
 # Initialize services
 @st.cache_resource
 def init_services():
+    blog_monitor = BlogMonitor()
+    ai_summarizer = AISummarizer()
+    content_intelligence = ContentIntelligence()
     return {
-        'blog_monitor': BlogMonitor(),
-        'ai_summarizer': AISummarizer(),
-        'content_intelligence': ContentIntelligence()
+        'blog_monitor': blog_monitor,
+        'ai_summarizer': ai_summarizer,
+        'content_intelligence': content_intelligence,
+        'scan_jobs': ScanJobManager(blog_monitor, ai_summarizer, content_intelligence)
     }
 
+# Cached page queries - each takes the models write version as its first
+# argument, so any commit in this process (approve, edit, mark posted,
+# remove, a finished scan) makes the next rerun query again. Rows come
+# back as plain dicts so cached values never hold ORM state.
+read_cache = st.cache_data(ttl=UI_READ_CACHE_TTL_SECONDS, max_entries=UI_READ_CACHE_MAX_ENTRIES, show_spinner=False)
+
+@read_cache
+def load_hero_counts(version):
+    db = next(get_db())
+    try:
+        return (
+            db.query(BlogPost).count(),
+            db.query(BlogPost).filter(BlogPost.is_approved == True).count(),
+            db.query(BlogPost).filter(BlogPost.is_posted == True).count(),
+        )
+    finally:
+        db.close()
+
+@read_cache
+def load_quick_post_count(version):
+    db = next(get_db())
+    try:
+        return db.query(BlogPost).filter(BlogPost.source_blog == 'Quick Generator').count()
+    finally:
+        db.close()
+
+@read_cache
+def load_candidates(version, limit):
+    """(up to limit candidates grouped by topic, whether there are more)"""
+    db = next(get_db())
+    try:
+        candidates = [candidate_to_dict(post) for post in get_candidates(db, limit=limit + 1)]
+        recent_approved, _ = get_approved_page(db, REVIEW_SIMILAR_APPROVED_LOOKBACK)
+        approved = [{'title': post.title, 'summary': post.summary} for post in recent_approved]
+    finally:
+        db.close()
+    arranged = services['content_intelligence'].arrange_for_review(candidates[:limit], approved)
+    return arranged, len(candidates) > limit
+
+@read_cache
+def load_keyword_names(version):
+    db = next(get_db())
+    try:
+        return get_keyword_names(db)
+    finally:
+        db.close()
+
+@read_cache
+def load_approved_page(version, page_size, cursor, keyword):
+    """(total matching, posts of the page, cursor of the next page)"""
+    db = next(get_db())
+    try:
+        total = count_approved(db, keyword)
+        posts, next_cursor = get_approved_page(db, page_size, cursor, keyword=keyword)
+        return total, [approved_post_to_dict(post) for post in posts], next_cursor
+    finally:
+        db.close()
+
+@read_cache
+def load_search_results(version, search, limit):
+    db = next(get_db())
+    try:
+        return [approved_post_to_dict(post) for post in search_approved_posts(db, search, limit=limit)]
+    finally:
+        db.close()
+
+@read_cache
+def load_analytics(version):
+    """Status totals, top approved sources and top approved keywords"""
+    db = next(get_db())
+    try:
+        return get_status_totals(db), get_source_counts(db, 'approved'), get_keyword_counts(db, 'approved', limit=10)
+    finally:
+        db.close()
+
 # Initialize session state
-if 'fresh_posts' not in st.session_state:
-    st.session_state.fresh_posts = []
+if 'prefilter_stats' not in st.session_state:
+    st.session_state.prefilter_stats = {}
 if 'editing_posts' not in st.session_state:
     st.session_state.editing_posts = set()
 if 'copied_posts' not in st.session_state:
     st.session_state.copied_posts = {}
+if 'post_cards' not in st.session_state:
+    st.session_state.post_cards = {}  # post id -> card state, see render_candidate_card
+if 'approved_cursors' not in st.session_state:
+    st.session_state.approved_cursors = [None]  # Keyset cursor of each visited Approved page
 if 'current_page' not in st.session_state:
     st.session_state.current_page = "Dashboard"
 
+def reset_approved_pagination():
+    st.session_state.approved_cursors = [None]
+    st.session_state.pop('approved_shown', None)
+
+def render_approved_pagination(page_number, page_size, total_approved, next_cursor):
+    col_prev, col_page, col_next = st.columns([1, 2, 1])
+    with col_prev:
+        if st.button("⬅️ Newer", disabled=page_number == 1, use_container_width=True):
+            st.session_state.approved_cursors.pop()
+            st.session_state.pop('approved_shown', None)
+            st.rerun()
+    with col_page:
+        total_pages = (total_approved + page_size - 1) // page_size
+        st.markdown(f"<div style='text-align: center;'>Page {page_number} of {total_pages}</div>", unsafe_allow_html=True)
+    with col_next:
+        if st.button("Older ➡️", disabled=next_cursor is None, use_container_width=True):
+            st.session_state.approved_cursors.append(next_cursor)
+            st.session_state.pop('approved_shown', None)
+            st.rerun()
+
+SCAN_STAGE_LABELS = {
+    'fetch': "📡 Fetching feeds",
+    'content': "📄 Reading articles",
+    'summarize': "📝 Summarizing",
+    'generate': "✨ Writing LinkedIn posts",
+}
+
+@st.fragment(run_every=1)
+def render_scan_job_progress(job_id):
+    """Live status of a running scan job; reruns the whole page once it finishes"""
+    job = services['scan_jobs'].get(job_id)
+    if job is None or job.finished:
+        st.rerun()
+    state = job.snapshot()
+    
+    st.markdown(f"**⏳ {state['description']}** - {state['status']}")
+    stage_total = state['stage_total']
+    st.progress(
+        state['stage_done'] / stage_total if stage_total else 0.0,
+        text=f"{SCAN_STAGE_LABELS.get(state['stage'], 'Waiting for a worker')} {state['stage_done']}/{stage_total}"
+    )
+    st.caption(f"Feeds done: {state['feeds_done']}/{state['feeds_total']} | Posts generated: {len(state['posts'])}")
+    for post in state['posts']:
+        st.markdown(f"- ✅ {post['title']} ({post['source_blog']})")
+    if st.button("⏹️ Cancel Scan", key=f"cancel_scan_{job_id}"):
+        services['scan_jobs'].cancel(job_id)
+
+def apply_finished_scan_job(job):
+    """Report a finished job's outcome once (its posts are already in the candidate store)"""
+    if st.session_state.get('scan_job_applied') == job.id:
+        return
+    state = job.snapshot()
+    st.session_state.scan_job_applied = job.id
+    st.session_state.prefilter_stats = state['prefilter_stats']
+    st.session_state.pipeline_report = state['report']
+    
+    if state['status'] == 'failed':
+        st.error(f"Error scanning blogs: {state['error']}")
+    elif state['status'] == 'cancelled':
+        st.warning(f"⏹️ Scan cancelled - kept {len(state['posts'])} posts generated so far")
+    elif state['posts']:
+        st.success(f"✅ Found {len(state['posts'])} new AI/ML posts! ({state['description']})")
+    else:
+        st.warning(f"⚠️ No new AI/ML content found ({state['description']}). Try a different date or range.")
+
+def candidate_to_dict(post):
+    """Stored candidate -> the post dict the Dashboard cards and preference tracking use"""
+    return {
+        'id': post.id,
+        'title': post.title,
+        'url': post.url,
+        'summary': post.summary,
+        'linkedin_post': post.linkedin_post,
+        'source_blog': post.source_blog,
+        'keywords': post.keywords_matched,
+        'story_sources': json.loads(post.story_sources) if post.story_sources else [],
+    }
+
+def regenerate_approved_post(post_id, title, url, keywords_matched):
+    """Edit-mode callback: rewrite the draft from the stored article text
+    
+    Posts saved before article text was stored fetch the page once and
+    keep it, so later regenerations never hit the network for the article.
+    """
+    db = next(get_db())
+    try:
+        content = get_post_content(db, post_id)
+        if not content and url.startswith(('http://', 'https://')):
+            content = services['blog_monitor'].get_full_content(url)
+            if content:
+                save_post_content(db, post_id, content)
+    finally:
+        db.close()
+    
+    if not content:
+        st.warning("No article text stored for this post")
+        return
+    summary = services['ai_summarizer'].summarize_content(title, content)
+    st.session_state[f"edit_area_{post_id}"] = services['ai_summarizer'].generate_linkedin_post(
+        title, summary, url, split_keywords(keywords_matched)
+    )
+
+def approved_post_to_dict(post):
+    """Approved row -> the card state an Approved card renders and updates"""
+    return {
+        'id': post.id,
+        'title': post.title,
+        'url': post.url,
+        'linkedin_post': post.linkedin_post,
+        'source_blog': post.source_blog,
+        'keywords_matched': post.keywords_matched,
+        'created_at': post.created_at,
+        'is_posted': post.is_posted,
+    }
+
+def render_show_more(state_key, shown, has_more):
+    """Lazy list rendering: reveal the next batch of cards"""
+    if has_more and st.button("⬇️ Show more", key=f"show_more_{state_key}", use_container_width=True):
+        st.session_state[state_key] = shown + UI_CARD_BATCH_SIZE
+        st.rerun()
+
+# Post cards are fragments: their buttons rerun only the card, so a click
+# costs the same however many cards are on screen. Actions are on_click
+# callbacks that update the card state in st.session_state.post_cards
+# before the card redraws; a full rerun reloads that state from the DB.
+
+def approve_candidate_card(post_id):
+    post = st.session_state.post_cards[post_id]
+    db = next(get_db())
+    try:
+        approved = approve_candidates(db, [post_id])
+    except Exception as e:
+        st.toast(f"Error saving post: {str(e)}")
+        return
+    finally:
+        db.close()
+    if approved:
+        # Keywords were counted towards trends when the scan stored the candidate
+        services['content_intelligence'].record_preference_event(post, 'approved')
+        post['outcome'] = "✅ Approved"
+    else:
+        post['outcome'] = "Already approved or dismissed"
+
+def dismiss_candidate_card(post_id):
+    db = next(get_db())
+    try:
+        dismiss_candidates(db, [post_id])
+        st.session_state.post_cards[post_id]['outcome'] = "🙈 Dismissed"
+    except Exception as e:
+        st.toast(f"Error dismissing post: {str(e)}")
+    finally:
+        db.close()
+
+def mark_card_posted(post_id):
+    db = next(get_db())
+    try:
+        db_post = mark_posted(db, post_id)
+        if db_post:
+            services['content_intelligence'].record_preference_event(
+                {'keywords_matched': db_post.keywords_matched, 'source_blog': db_post.source_blog},
+                'posted'
+            )
+            st.session_state.post_cards[post_id]['is_posted'] = True
+            st.toast("✅ Marked as posted!")
+    except Exception as e:
+        st.toast(f"Error: {str(e)}")
+    finally:
+        db.close()
+
+def remove_card(post_id):
+    db = next(get_db())
+    try:
+        db_post = remove_post(db, post_id)
+        if db_post:
+            removed_post = {'keywords_matched': db_post.keywords_matched, 'source_blog': db_post.source_blog}
+            services['content_intelligence'].record_preference_event(removed_post, 'removed')
+            st.session_state.post_cards[post_id]['outcome'] = "🗑️ Removed"
+    except Exception as e:
+        st.toast(f"Error: {str(e)}")
+    finally:
+        db.close()
+
+def start_editing_card(post_id):
+    st.session_state.editing_posts.add(post_id)
+
+def stop_editing_card(post_id):
+    st.session_state.editing_posts.discard(post_id)
+    st.session_state.pop(f"edit_area_{post_id}", None)
+
+def save_card_edit(post_id):
+    post = st.session_state.post_cards[post_id]
+    edited_content = st.session_state[f"edit_area_{post_id}"]
+    db = next(get_db())
+    try:
+        services['content_intelligence'].invalidate_engagement(post['title'], post['linkedin_post'])
+        db_post = update_linkedin_post(db, post_id, edited_content)
+        if db_post:
+            post['linkedin_post'] = edited_content
+            st.toast("✅ Post updated!")
+    except Exception as e:
+        st.toast(f"Error: {str(e)}")
+        return
+    finally:
+        db.close()
+    stop_editing_card(post_id)
+
+@st.fragment
+def render_candidate_card(post_id):
+    """One Dashboard candidate with Approve / Dismiss"""
+    post = st.session_state.post_cards.get(post_id)
+    if post is None:
+        return
+    if post.get('outcome'):
+        st.caption(f"{post['outcome']}: {post['title']}")
+        return
+    
+    other_sources = [source for source in post.get('story_sources', []) if source != post['source_blog']]
+    with st.container():
+        st.markdown(f"""
+        <div class="glass-card">
+            <h3 class="card-title">📰 {post['title']}</h3>
+            <div class="card-content">
+                <p><strong>🏷️ Keywords:</strong> <span style="background: linear-gradient(135deg, #667eea, #764ba2); -webkit-background-clip: text; -webkit-text-fill-color: transparent; font-weight: 600;">{post['keywords']}</span></p>
+                <p><strong>🌐 Source:</strong> {post['source_blog']}</p>
+                {f"<p><strong>🗞️ Also covered by:</strong> {', '.join(other_sources)}</p>" if other_sources else ''}
+                {f"<p><strong>🔁 Similar to approved:</strong> {post['similar_approved_title']}</p>" if post.get('similar_approved_title') else ''}
+                <p><strong>📝 Summary:</strong> {post['summary']}</p>
+            </div>
+        </div>
+        """, unsafe_allow_html=True)
+        
+        st.markdown("**📱 LinkedIn Post Preview:**")
+        st.markdown(f"""
+        <div class="linkedin-post">
+            {post['linkedin_post'].replace(chr(10), '<br>')}
+        </div>
+        """, unsafe_allow_html=True)
+        
+        col1, col2, col3 = st.columns([1, 1, 1])
+        with col1:
+            st.button(f"✅ Approve & Save", key=f"approve_fresh_{post_id}", use_container_width=True,
+                      on_click=approve_candidate_card, args=(post_id,))
+        
+        with col2:
+            st.button("🙈 Dismiss", key=f"dismiss_fresh_{post_id}", use_container_width=True,
+                      on_click=dismiss_candidate_card, args=(post_id,))
+        
+        with col3:
+            st.link_button("🔗 View Original", post['url'], use_container_width=True)
+
+@st.fragment
+def render_approved_card(post_id):
+    """One Approved post with copy, edit, mark posted and remove"""
+    post = st.session_state.post_cards.get(post_id)
+    if post is None:
+        return
+    if post.get('outcome'):
+        st.caption(f"{post['outcome']}: {post['title']}")
+        return
+    is_editing = post_id in st.session_state.editing_posts
+    
+    with st.container():
+        status_badge = "<span class='status-badge status-posted'>✅ Posted</span>" if post['is_posted'] else "<span class='status-badge status-approved'>📝 Approved</span>"
+        
+        st.markdown(f"""
+        <div class="glass-card">
+            <div style="display: flex; justify-content: space-between; align-items: start; margin-bottom: 1rem;">
+                <h3 class="card-title" style="margin: 0;">📰 {post['title']}</h3>
+                {status_badge}
+            </div>
+            <div class="card-content">
+                <p><strong>🏷️ Keywords:</strong> <span style="background: linear-gradient(135deg, #667eea, #764ba2); -webkit-background-clip: text; -webkit-text-fill-color: transparent; font-weight: 600;">{post['keywords_matched'] or 'N/A'}</span></p>
+                <p><strong>🌐 Source:</strong> {post['source_blog']}</p>
+                <p><strong>📅 Created:</strong> {post['created_at'].strftime('%Y-%m-%d %H:%M')}</p>
+            </div>
+        </div>
+        """, unsafe_allow_html=True)
+        
+        if not is_editing:
+            st.markdown("**📱 LinkedIn Post:**")
+            st.markdown(f"""
+            <div class="linkedin-post">
+                {post['linkedin_post'].replace(chr(10), '<br>')}
+            </div>
+            """, unsafe_allow_html=True)
+            
+            # Action buttons
+            col1, col2, col3, col4, col5 = st.columns(5)
+            
+            with col1:
+                st.link_button("🔗 Original", post['url'], use_container_width=True)
+            
+            with col2:
+                if st.button("📋 Copy", key=f"copy_{post_id}", use_container_width=True):
+                    st.session_state.copied_posts[post_id] = post['linkedin_post']
+                    st.markdown("""
+                    <div class="copy-container">
+                        <p style="color: #28a745; font-weight: bold; margin-bottom: 0.5rem;">✅ Select and copy the text below:</p>
+                        <div class="copy-text">{}</div>
+                    </div>
+                    """.format(post['linkedin_post'].replace('\n', '<br>')), unsafe_allow_html=True)
+            
+            with col3:
+                st.button("✏️ Edit", key=f"edit_{post_id}", use_container_width=True,
+                          on_click=start_editing_card, args=(post_id,))
+            
+            with col4:
+                if not post['is_posted']:
+                    st.button("🚀 Mark Posted", key=f"posted_{post_id}", use_container_width=True,
+                              on_click=mark_card_posted, args=(post_id,))
+                else:
+                    st.markdown("<div style='text-align: center; color: #28a745; font-weight: bold;'>✅ Posted</div>", unsafe_allow_html=True)
+            
+            with col5:
+                st.button("🗑️ Remove", key=f"remove_{post_id}", use_container_width=True,
+                          on_click=remove_card, args=(post_id,))
+        
+        else:
+            # Edit mode
+            st.markdown("**Edit LinkedIn Post:**")
+            if f"edit_area_{post_id}" not in st.session_state:
+                # Seeded through session state so Regenerate can replace the draft
+                st.session_state[f"edit_area_{post_id}"] = post['linkedin_post']
+            st.text_area(
+                "Edit content:", 
+                height=150, 
+                key=f"edit_area_{post_id}"
+            )
+            
+            col_save, col_regenerate, col_cancel = st.columns(3)
+            with col_save:
+                st.button("💾 Save Changes", key=f"save_{post_id}", type="primary", use_container_width=True,
+                          on_click=save_card_edit, args=(post_id,))
+            
+            with col_regenerate:
+                st.button("♻️ Regenerate", key=f"regenerate_{post_id}", use_container_width=True,
+                          on_click=regenerate_approved_post,
+                          args=(post_id, post['title'], post['url'], post['keywords_matched']))
+            
+            with col_cancel:
+                st.button("❌ Cancel", key=f"cancel_{post_id}", use_container_width=True,
+                          on_click=stop_editing_card, args=(post_id,))
+
 # Page config
 st.set_page_config(
     page_title="AI LinkedIn Post Generator",
@@ -433,15 +875,11 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 # Initialize database and services
-create_tables()
+init_database()
 services = init_services()
 
 # Hero Header with Stats
-db = next(get_db())
-total_posts = db.query(BlogPost).count()
-approved_count = db.query(BlogPost).filter(BlogPost.is_approved == True).count()
-posted_count = db.query(BlogPost).filter(BlogPost.is_posted == True).count()
-db.close()
+total_posts, approved_count, posted_count = load_hero_counts(get_write_version())
 
 st.markdown(f"""
 <div class="hero-container">
@@ -529,54 +967,27 @@ if st.session_state.current_page == "Dashboard":
     # Dashboard Header with Action Button
     col1, col2, col3 = st.columns([1, 1, 1])
     
+    scan_job = services['scan_jobs'].get(st.session_state.get('scan_job_id'))
+    scan_running = scan_job is not None and not scan_job.finished
+    
     with col2:
-        if st.button("🔄 Scan Blogs Now", type="primary", use_container_width=True):
-            with st.spinner("Scanning blogs..."):
-                try:
-                    posts = services['blog_monitor'].fetch_blog_posts(BLOG_URLS)
-                    
-                    processed_posts = []
-                    # Group posts by source to ensure diversity
-                    source_posts = {}
-                    for post_data in posts:
-                        source = post_data['source_blog']
-                        if source not in source_posts:
-                            source_posts[source] = []
-                        source_posts[source].append(post_data)
-                    
-                    # Process up to 2 posts per source for diversity
-                    for source, source_post_list in source_posts.items():
-                        for post_data in source_post_list[:2]:  # Max 2 per source
-                            try:
-                                full_content = services['blog_monitor'].get_full_content(post_data['url'])
-                                keywords = services['blog_monitor'].is_ai_related(post_data['title'], full_content)
-                                if keywords:
-                                    summary = services['ai_summarizer'].summarize_content(post_data['title'], full_content)
-                                    linkedin_post = services['ai_summarizer'].generate_linkedin_post(
-                                        post_data['title'], summary, post_data['url'], keywords
-                                    )
-                                    processed_posts.append({
-                                        'title': post_data['title'],
-                                        'url': post_data['url'],
-                                        'summary': summary,
-                                        'linkedin_post': linkedin_post,
-                                        'source_blog': post_data['source_blog'],
-                                        'keywords': ', '.join(keywords)
-                                    })
-                            except Exception as e:
-                                print(f"Error processing post from {source}: {e}")
-                                continue
-                    
-                    st.session_state.fresh_posts = processed_posts
-                    st.success(f"✅ Found {len(processed_posts)} AI/ML posts!")
-                    
-                except Exception as e:
-                    st.error(f"Error scanning blogs: {str(e)}")
+        if st.button("🔄 Scan Blogs Now", type="primary", use_container_width=True, disabled=scan_running):
+            scan_job = services['scan_jobs'].submit_recent(BLOG_URLS)
+            st.session_state.scan_job_id = scan_job.id
+            scan_running = True
     
-
+    # Scans run as background jobs; the page keeps working while they do
+    if scan_running:
+        render_scan_job_progress(scan_job.id)
+    elif scan_job is not None:
+        apply_finished_scan_job(scan_job)
+    
+    # Candidates come from the database, so every session sees the same scan results
+    candidates_shown = st.session_state.get('candidates_shown', UI_CARD_BATCH_SIZE)
+    fresh_posts, more_candidates = load_candidates(get_write_version(), candidates_shown)
     
     # Display fresh posts
-    if st.session_state.fresh_posts:
+    if fresh_posts:
         st.markdown("""
         <div class="glass-card">
             <h2 class="card-title">🆕 Fresh AI/ML Content</h2>
@@ -584,53 +995,33 @@ if st.session_state.current_page == "Dashboard":
         </div>
         """, unsafe_allow_html=True)
         
-        for i, post in enumerate(st.session_state.fresh_posts):
-            with st.container():
-                st.markdown(f"""
-                <div class="glass-card">
-                    <h3 class="card-title">📰 {post['title']}</h3>
-                    <div class="card-content">
-                        <p><strong>🏷️ Keywords:</strong> <span style="background: linear-gradient(135deg, #667eea, #764ba2); -webkit-background-clip: text; -webkit-text-fill-color: transparent; font-weight: 600;">{post['keywords']}</span></p>
-                        <p><strong>🌐 Source:</strong> {post['source_blog']}</p>
-                        <p><strong>📝 Summary:</strong> {post['summary']}</p>
-                    </div>
-                </div>
-                """, unsafe_allow_html=True)
-                
-                st.markdown("**📱 LinkedIn Post Preview:**")
-                st.markdown(f"""
-                <div class="linkedin-post">
-                    {post['linkedin_post'].replace(chr(10), '<br>')}
-                </div>
-                """, unsafe_allow_html=True)
-                
-                col1, col2 = st.columns([1, 1])
-                with col1:
-                    if st.button(f"✅ Approve & Save", key=f"approve_fresh_{i}_{hash(post['url'])}", use_container_width=True):
-                        try:
-                            db = next(get_db())
-                            existing = db.query(BlogPost).filter(BlogPost.url == post['url']).first()
-                            if not existing:
-                                new_post = BlogPost(
-                                    title=post['title'],
-                                    url=post['url'],
-                                    summary=post['summary'],
-                                    linkedin_post=post['linkedin_post'],
-                                    source_blog=post['source_blog'],
-                                    keywords_matched=post['keywords'],
-                                    is_approved=True
-                                )
-                                db.add(new_post)
-                                db.commit()
-                                st.success("✅ Post approved and saved!")
-                            else:
-                                st.warning("Post already exists in database")
-                            db.close()
-                        except Exception as e:
-                            st.error(f"Error saving post: {str(e)}")
-                
-                with col2:
-                    st.link_button("🔗 View Original", post['url'], use_container_width=True)
+        stats = st.session_state.prefilter_stats
+        if stats:
+            st.caption(
+                f"🧹 Pre-filter: {stats.get('accept', 0)} accepted, {stats.get('reject', 0)} rejected, "
+                f"{stats.get('fetch', 0)} needed the full article - {stats.get('fetches_saved', 0)} page fetches saved"
+            )
+        if st.session_state.get('pipeline_report'):
+            st.caption(f"⏱️ Pipeline: {st.session_state.pipeline_report}")
+        
+        if st.button(f"✅ Approve All ({len(fresh_posts)})", key="approve_all_fresh", type="primary"):
+            db = next(get_db())
+            try:
+                approved_ids = {post.id for post in approve_candidates(db, [post['id'] for post in fresh_posts])}
+                approved_posts = [post for post in fresh_posts if post['id'] in approved_ids]
+                services['content_intelligence'].record_preference_events(approved_posts, 'approved')
+                skipped = len(fresh_posts) - len(approved_posts)
+                st.toast(f"✅ {len(approved_posts)} posts approved" + (f" ({skipped} already handled elsewhere)" if skipped else ""))
+                st.rerun()
+            except Exception as e:
+                st.error(f"Error approving posts: {str(e)}")
+            finally:
+                db.close()
+        
+        for post in fresh_posts:
+            st.session_state.post_cards[post['id']] = post
+            render_candidate_card(post['id'])
+        render_show_more('candidates_shown', candidates_shown, more_candidates)
 
     # Date Search Controls
     col_date, col_range, col_search = st.columns([2, 1, 1])
@@ -643,52 +1034,13 @@ if st.session_state.current_page == "Dashboard":
     
     with col_search:
         st.markdown("<br>", unsafe_allow_html=True)
-        if st.button("🔍 Search Posts", use_container_width=True, type="primary"):
-            with st.spinner("Searching posts by date..."):
-                try:
-                    target_datetime = datetime.combine(selected_date, datetime.min.time())
-                    posts = services['blog_monitor'].fetch_posts_by_date(BLOG_URLS, target_datetime, range_days)
-                    
-                    processed_posts = []
-                    source_posts = {}
-                    for post_data in posts:
-                        source = post_data['source_blog']
-                        if source not in source_posts:
-                            source_posts[source] = []
-                        source_posts[source].append(post_data)
-                    
-                    for source, source_post_list in source_posts.items():
-                        for post_data in source_post_list[:2]:
-                            try:
-                                full_content = services['blog_monitor'].get_full_content(post_data['url'])
-                                keywords = services['blog_monitor'].is_ai_related(post_data['title'], full_content)
-                                if keywords:
-                                    summary = services['ai_summarizer'].summarize_content(post_data['title'], full_content)
-                                    linkedin_post = services['ai_summarizer'].generate_linkedin_post(
-                                        post_data['title'], summary, post_data['url'], keywords
-                                    )
-                                    processed_posts.append({
-                                        'title': post_data['title'],
-                                        'url': post_data['url'],
-                                        'summary': summary,
-                                        'linkedin_post': linkedin_post,
-                                        'source_blog': post_data['source_blog'],
-                                        'keywords': ', '.join(keywords)
-                                    })
-                            except Exception as e:
-                                print(f"Error processing post from {source}: {e}")
-                                continue
-                    
-                    st.session_state.fresh_posts = processed_posts
-                    if processed_posts:
-                        st.success(f"✅ Found {len(processed_posts)} AI/ML posts for {selected_date}!")
-                        st.rerun()
-                    else:
-                        st.warning(f"⚠️ No AI/ML content found for {selected_date}. Try a different date or range.")
-                        
-                except Exception as e:
-                    st.error(f"❌ Search Error: {str(e)}")
-                    st.info("💡 Try adjusting your date range or check your internet connection")
+        if st.button("🔍 Search Posts", use_container_width=True, type="primary", disabled=scan_running):
+            target_datetime = datetime.combine(selected_date, datetime.min.time())
+            scan_job = services['scan_jobs'].submit_by_date(BLOG_URLS, target_datetime, range_days)
+            st.session_state.scan_job_id = scan_job.id
+            if scan_job.finished:  # Identical search ran recently - its candidates are already listed above
+                st.toast(f"♻️ Same search finished at {scan_job.finished_at:%H:%M} UTC - reusing its results")
+            st.rerun()
 
 elif st.session_state.current_page == "Quick":
     st.markdown("""
@@ -776,23 +1128,30 @@ elif st.session_state.current_page == "Quick":
                         
                         with col_save:
                             if st.button("💾 Save to Approved", use_container_width=True):
+                                db = next(get_db())
                                 try:
-                                    db = next(get_db())
-                                    new_post = BlogPost(
+                                    saved = add_approved_post(
+                                        db,
                                         title=title,
                                         url=content_input if content_input.startswith('http') else '',
                                         summary=summary,
                                         linkedin_post=linkedin_post,
                                         source_blog='Quick Generator',
                                         keywords_matched=', '.join(keywords),
-                                        is_approved=True
+                                        content=full_content if content_input.startswith(('http://', 'https://')) else content_input
                                     )
-                                    db.add(new_post)
-                                    db.commit()
-                                    db.close()
-                                    st.success("✅ Post saved to approved posts!")
+                                    if saved is None:
+                                        st.warning("⚠️ This post is already saved")
+                                    else:
+                                        quick_post = {'keywords': keywords, 'source_blog': 'Quick Generator'}
+                                        # Saving is this post's ingestion - it never was a scan candidate
+                                        services['content_intelligence'].record_post_keywords(quick_post)
+                                        services['content_intelligence'].record_preference_event(quick_post, 'approved')
+                                        st.success("✅ Post saved to approved posts!")
                                 except Exception as e:
                                     st.error(f"Error saving: {str(e)}")
+                                finally:
+                                    db.close()
                         
                     except Exception as e:
                         st.error(f"❌ Error generating post: {str(e)}")
@@ -815,9 +1174,7 @@ elif st.session_state.current_page == "Quick":
         """, unsafe_allow_html=True)
         
         # Quick stats
-        db = next(get_db())
-        quick_posts = db.query(BlogPost).filter(BlogPost.source_blog == 'Quick Generator').count()
-        db.close()
+        quick_posts = load_quick_post_count(get_write_version())
         
         st.markdown(f"""
         <div class="metric-card">
@@ -834,126 +1191,97 @@ elif st.session_state.current_page == "Approved":
     </div>
     """, unsafe_allow_html=True)
     
-    # Get approved posts
-    db = next(get_db())
-    approved_posts = db.query(BlogPost).filter(BlogPost.is_approved == True).order_by(BlogPost.created_at.desc()).all()
-    db.close()
+    # Get one page of approved posts (keyset pagination on created_at, id)
+    search_query = st.text_input("🔍 Search approved posts:", key="approved_search",
+                                 placeholder="Search titles, summaries and LinkedIn posts...",
+                                 on_change=reset_approved_pagination)
+    
+    write_version = get_write_version()
+    col_size, col_keyword, col_info = st.columns([1, 1, 2])
+    with col_size:
+        page_size = st.selectbox("Posts per page:", [10, 20, 50], key="approved_page_size",
+                                 on_change=reset_approved_pagination)
+    with col_keyword:
+        keyword_filter = st.selectbox("Keyword:", ["All keywords"] + load_keyword_names(write_version),
+                                      key="approved_keyword_filter", on_change=reset_approved_pagination)
+    keyword_filter = None if keyword_filter == "All keywords" else keyword_filter
+    
+    if search_query.strip():
+        # Full-text results replace the paginated listing
+        approved_posts = load_search_results(write_version, search_query, page_size)
+        if keyword_filter:
+            approved_posts = [post for post in approved_posts if keyword_filter in split_keywords(post['keywords_matched'])]
+        total_approved, next_cursor = len(approved_posts), None
+    else:
+        total_approved, approved_posts, next_cursor = load_approved_page(
+            write_version, page_size, st.session_state.approved_cursors[-1], keyword_filter
+        )
+    
+    page_number = len(st.session_state.approved_cursors)
+    if not approved_posts and page_number > 1 and not search_query.strip():
+        # The last rows of this page were removed - step back
+        st.session_state.approved_cursors.pop()
+        st.rerun()
+    
+    with col_info:
+        if search_query.strip():
+            st.markdown(f"<br>{total_approved} best matches for \"{search_query.strip()}\"", unsafe_allow_html=True)
+        elif total_approved:
+            first_shown = (page_number - 1) * page_size + 1
+            st.markdown(f"<br>Showing {first_shown}-{first_shown + len(approved_posts) - 1} of {total_approved} approved posts",
+                        unsafe_allow_html=True)
     
     if approved_posts:
-        for post in approved_posts:
-            post_id = post.id
-            is_editing = post_id in st.session_state.editing_posts
-            
-            with st.container():
-                status_badge = "<span class='status-badge status-posted'>✅ Posted</span>" if post.is_posted else "<span class='status-badge status-approved'>📝 Approved</span>"
-                
-                st.markdown(f"""
-                <div class="glass-card">
-                    <div style="display: flex; justify-content: space-between; align-items: start; margin-bottom: 1rem;">
-                        <h3 class="card-title" style="margin: 0;">📰 {post.title}</h3>
-                        {status_badge}
-                    </div>
-                    <div class="card-content">
-                        <p><strong>🏷️ Keywords:</strong> <span style="background: linear-gradient(135deg, #667eea, #764ba2); -webkit-background-clip: text; -webkit-text-fill-color: transparent; font-weight: 600;">{post.keywords_matched or 'N/A'}</span></p>
-                        <p><strong>🌐 Source:</strong> {post.source_blog}</p>
-                        <p><strong>📅 Created:</strong> {post.created_at.strftime('%Y-%m-%d %H:%M')}</p>
-                    </div>
-                </div>
-                """, unsafe_allow_html=True)
-                
-                if not is_editing:
-                    st.markdown("**📱 LinkedIn Post:**")
-                    st.markdown(f"""
-                    <div class="linkedin-post">
-                        {post.linkedin_post.replace(chr(10), '<br>')}
-                    </div>
-                    """, unsafe_allow_html=True)
-                    
-                    # Action buttons
-                    col1, col2, col3, col4, col5 = st.columns(5)
-                    
-                    with col1:
-                        st.link_button("🔗 Original", post.url, use_container_width=True)
-                    
-                    with col2:
-                        if st.button("📋 Copy", key=f"copy_{post_id}", use_container_width=True):
-                            st.session_state.copied_posts[post_id] = post.linkedin_post
-                            st.markdown("""
-                            <div class="copy-container">
-                                <p style="color: #28a745; font-weight: bold; margin-bottom: 0.5rem;">✅ Select and copy the text below:</p>
-                                <div class="copy-text">{}</div>
-                            </div>
-                            """.format(post.linkedin_post.replace('\n', '<br>')), unsafe_allow_html=True)
-                    
-                    with col3:
-                        if st.button("✏️ Edit", key=f"edit_{post_id}", use_container_width=True):
-                            st.session_state.editing_posts.add(post_id)
-                            st.rerun()
-                    
-                    with col4:
-                        if not post.is_posted:
-                            if st.button("🚀 Mark Posted", key=f"posted_{post_id}", use_container_width=True):
-                                try:
-                                    db = next(get_db())
-                                    db_post = db.query(BlogPost).filter(BlogPost.id == post_id).first()
-                                    if db_post:
-                                        db_post.is_posted = True
-                                        db.commit()
-                                        st.success("✅ Marked as posted!")
-                                    db.close()
-                                    time.sleep(0.5)
-                                    st.rerun()
-                                except Exception as e:
-                                    st.error(f"Error: {str(e)}")
-                        else:
-                            st.markdown("<div style='text-align: center; color: #28a745; font-weight: bold;'>✅ Posted</div>", unsafe_allow_html=True)
-                    
-                    with col5:
-                        if st.button("🗑️ Remove", key=f"remove_{post_id}", use_container_width=True):
-                            try:
-                                db = next(get_db())
-                                db_post = db.query(BlogPost).filter(BlogPost.id == post_id).first()
-                                if db_post:
-                                    db.delete(db_post)
-                                    db.commit()
-                                    st.success("✅ Post removed!")
-                                db.close()
-                                time.sleep(0.5)
-                                st.rerun()
-                            except Exception as e:
-                                st.error(f"Error: {str(e)}")
-                
-                else:
-                    # Edit mode
-                    st.markdown("**Edit LinkedIn Post:**")
-                    edited_content = st.text_area(
-                        "Edit content:", 
-                        value=post.linkedin_post, 
-                        height=150, 
-                        key=f"edit_area_{post_id}"
-                    )
-                    
-                    col_save, col_cancel = st.columns(2)
-                    with col_save:
-                        if st.button("💾 Save Changes", key=f"save_{post_id}", type="primary", use_container_width=True):
-                            try:
-                                db = next(get_db())
-                                db_post = db.query(BlogPost).filter(BlogPost.id == post_id).first()
-                                if db_post:
-                                    db_post.linkedin_post = edited_content
-                                    db.commit()
-                                    st.success("✅ Post updated!")
-                                db.close()
-                                st.session_state.editing_posts.discard(post_id)
-                                time.sleep(0.5)
-                                st.rerun()
-                            except Exception as e:
-                                st.error(f"Error: {str(e)}")
-                    
-                    with col_cancel:
-                        if st.button("❌ Cancel", key=f"cancel_{post_id}", use_container_width=True):
-                            st.session_state.editing_posts.discard(post_id)
-                            st.rerun()
+        # Bulk actions on the checked posts of this page, one transaction each
+        selected_ids = [post['id'] for post in approved_posts if st.session_state.get(f"select_{post['id']}")]
+        if selected_ids:
+            col_selected, col_bulk_posted, col_bulk_remove = st.columns([2, 1, 1])
+            with col_selected:
+                st.markdown(f"<br>{len(selected_ids)} selected", unsafe_allow_html=True)
+            with col_bulk_posted:
+                if st.button("🚀 Mark Selected Posted", use_container_width=True):
+                    db = next(get_db())
+                    try:
+                        changed = [
+                            {'keywords_matched': db_post.keywords_matched, 'source_blog': db_post.source_blog}
+                            for db_post in mark_posts_posted(db, selected_ids)
+                        ]
+                        services['content_intelligence'].record_preference_events(changed, 'posted')
+                        for post_id in selected_ids:
+                            st.session_state.pop(f"select_{post_id}", None)
+                        st.rerun()
+                    except Exception as e:
+                        st.error(f"Error: {str(e)}")
+                    finally:
+                        db.close()
+            with col_bulk_remove:
+                if st.button("🗑️ Remove Selected", use_container_width=True):
+                    db = next(get_db())
+                    try:
+                        removed = [
+                            {'keywords_matched': db_post.keywords_matched, 'source_blog': db_post.source_blog}
+                            for db_post in remove_posts(db, selected_ids)
+                        ]
+                        services['content_intelligence'].record_preference_events(removed, 'removed')
+                        for post_id in selected_ids:
+                            st.session_state.pop(f"select_{post_id}", None)
+                        st.rerun()
+                    except Exception as e:
+                        st.error(f"Error: {str(e)}")
+                    finally:
+                        db.close()
+        
+        approved_shown = st.session_state.get('approved_shown', UI_CARD_BATCH_SIZE)
+        for post in approved_posts[:approved_shown]:
+            # The checkbox feeds the page-level bulk bar, so it stays outside the card fragment
+            st.checkbox("Select", key=f"select_{post['id']}")
+            st.session_state.post_cards[post['id']] = post
+            render_approved_card(post['id'])
+        render_show_more('approved_shown', approved_shown, len(approved_posts) > approved_shown)
+        
+        # Page navigation (hidden while showing search results)
+        if not search_query.strip():
+            render_approved_pagination(page_number, page_size, total_approved, next_cursor)
     else:
         st.markdown("""
         <div class="glass-card" style="text-align: center; padding: 4rem;">
@@ -994,12 +1322,8 @@ elif st.session_state.current_page == "Analytics":
     </div>
     """, unsafe_allow_html=True)
     
-    # Get analytics data
-    db = next(get_db())
-    all_posts = db.query(BlogPost).all()
-    approved_posts = db.query(BlogPost).filter(BlogPost.is_approved == True).all()
-    posted_posts = db.query(BlogPost).filter(BlogPost.is_posted == True).all()
-    db.close()
+    # Get analytics data (pre-aggregated in daily_post_rollups)
+    status_totals, source_counts, keyword_counts = load_analytics(get_write_version())
     
     # Enhanced Metrics Dashboard
     st.markdown("""
@@ -1013,7 +1337,7 @@ elif st.session_state.current_page == "Analytics":
     with col1:
         st.markdown(f"""
         <div class="metric-card">
-            <div class="metric-number">{len(all_posts)}</div>
+            <div class="metric-number">{status_totals['total']}</div>
             <div class="metric-label">Total Posts</div>
         </div>
         """, unsafe_allow_html=True)
@@ -1021,7 +1345,7 @@ elif st.session_state.current_page == "Analytics":
     with col2:
         st.markdown(f"""
         <div class="metric-card">
-            <div class="metric-number">{len(approved_posts)}</div>
+            <div class="metric-number">{status_totals['approved']}</div>
             <div class="metric-label">Approved Posts</div>
         </div>
         """, unsafe_allow_html=True)
@@ -1029,13 +1353,13 @@ elif st.session_state.current_page == "Analytics":
     with col3:
         st.markdown(f"""
         <div class="metric-card">
-            <div class="metric-number">{len(posted_posts)}</div>
+            <div class="metric-number">{status_totals['posted']}</div>
             <div class="metric-label">Posted to LinkedIn</div>
         </div>
         """, unsafe_allow_html=True)
     
     with col4:
-        approval_rate = (len(approved_posts) / len(all_posts) * 100) if all_posts else 0
+        approval_rate = (status_totals['approved'] / status_totals['total'] * 100) if status_totals['total'] else 0
         st.markdown(f"""
         <div class="metric-card">
             <div class="metric-number">{approval_rate:.1f}%</div>
@@ -1044,7 +1368,7 @@ elif st.session_state.current_page == "Analytics":
         """, unsafe_allow_html=True)
     
     # Enhanced Analytics
-    if approved_posts:
+    if status_totals['approved']:
         col1, col2 = st.columns(2)
         
         with col1:
@@ -1054,12 +1378,7 @@ elif st.session_state.current_page == "Analytics":
             </div>
             """, unsafe_allow_html=True)
             
-            source_counts = {}
-            for post in approved_posts:
-                source = post.source_blog
-                source_counts[source] = source_counts.get(source, 0) + 1
-            
-            source_df = pd.DataFrame(list(source_counts.items()), columns=['Source', 'Posts'])
+            source_df = pd.DataFrame(source_counts, columns=['Source', 'Posts'])
             st.bar_chart(source_df.set_index('Source'))
         
         with col2:
@@ -1069,16 +1388,8 @@ elif st.session_state.current_page == "Analytics":
             </div>
             """, unsafe_allow_html=True)
             
-            keyword_counts = {}
-            for post in approved_posts:
-                if post.keywords_matched:
-                    keywords = [k.strip() for k in post.keywords_matched.split(',')]
-                    for keyword in keywords:
-                        keyword_counts[keyword] = keyword_counts.get(keyword, 0) + 1
-            
             if keyword_counts:
-                keyword_df = pd.DataFrame(list(keyword_counts.items()), columns=['Keyword', 'Count'])
-                keyword_df = keyword_df.sort_values('Count', ascending=False).head(10)
+                keyword_df = pd.DataFrame(keyword_counts, columns=['Keyword', 'Count'])
                 st.bar_chart(keyword_df.set_index('Keyword'))
             else:
                 st.info("No keyword data available yet")
@@ -0,0 +1,60 @@
+# Trending keywords - persistent hourly buckets with exponential decay
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from models import KeywordBucket
+from config import TRENDING_WINDOW_HOURS, TRENDING_HALF_LIFE_HOURS, TRENDING_RETENTION_DAYS
+
+
+def bucket_start(timestamp: datetime) -> datetime:
+    """Start of the hourly bucket a timestamp falls into"""
+    return timestamp.replace(minute=0, second=0, microsecond=0)
+
+
+def record_keyword_counts(db: Session, counts: Dict[str, int], timestamp: Optional[datetime] = None):
+    """Add several posts' keyword counts to one hourly bucket in a single commit"""
+    start = bucket_start(timestamp or datetime.utcnow())
+    for keyword, count in counts.items():
+        updated = db.query(KeywordBucket).filter(
+            KeywordBucket.bucket_start == start,
+            KeywordBucket.keyword == keyword
+        ).update({KeywordBucket.count: KeywordBucket.count + count}, synchronize_session=False)
+        if not updated:
+            db.add(KeywordBucket(bucket_start=start, keyword=keyword, count=count))
+    db.commit()
+
+
+def get_trending_keywords(db: Session, limit: int = 10, now: Optional[datetime] = None,
+                          window_hours: int = TRENDING_WINDOW_HOURS,
+                          half_life_hours: float = TRENDING_HALF_LIFE_HOURS) -> List[Tuple[str, float]]:
+    """Top keywords over the sliding window, each bucket weighted by its age
+
+    Reads at most window_hours buckets per keyword, regardless of how many
+    posts have been ingested overall.
+    """
+    now = now or datetime.utcnow()
+    cutoff = bucket_start(now - timedelta(hours=window_hours))
+
+    scores = defaultdict(float)
+    buckets = db.query(KeywordBucket.keyword, KeywordBucket.bucket_start, KeywordBucket.count).filter(
+        KeywordBucket.bucket_start >= cutoff
+    )
+    for keyword, start, count in buckets:
+        age_hours = max(0.0, (now - start).total_seconds() / 3600)
+        scores[keyword] += count * 0.5 ** (age_hours / half_life_hours)
+
+    return sorted(scores.items(), key=lambda item: item[1], reverse=True)[:limit]
+
+
+def prune_buckets(db: Session, now: Optional[datetime] = None,
+                  retention_days: int = TRENDING_RETENTION_DAYS) -> int:
+    """Delete buckets older than the retention period, returns rows removed"""
+    cutoff = (now or datetime.utcnow()) - timedelta(days=retention_days)
+    removed = db.query(KeywordBucket).filter(
+        KeywordBucket.bucket_start < cutoff
+    ).delete(synchronize_session=False)
+    db.commit()
+    return removed